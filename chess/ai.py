@@ -4,94 +4,32 @@ Simple chess AI using minimax with alpha-beta pruning.
 
 import random
 from constants import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, BLACK
+from board import (
+    COLOR_INDEX, PIECE_TYPES, PIECE_VALUES, iter_squares, decode_move,
+    MOVE_CAPTURE, MOVE_EN_PASSANT, MOVE_CASTLE, MOVE_DOUBLE_PUSH
+)
 
 
-# Piece values for evaluation
-PIECE_VALUES = {
-    PAWN: 100,
-    KNIGHT: 320,
-    BISHOP: 330,
-    ROOK: 500,
-    QUEEN: 900,
-    KING: 20000
-}
+# Checkmate score; anything beyond MATE_THRESHOLD is a forced mate
+MATE_SCORE = 100000
+MATE_THRESHOLD = 50000
 
-# Position bonuses for pieces (encourages good piece placement)
-PAWN_TABLE = [
-    [0,  0,  0,  0,  0,  0,  0,  0],
-    [50, 50, 50, 50, 50, 50, 50, 50],
-    [10, 10, 20, 30, 30, 20, 10, 10],
-    [5,  5, 10, 25, 25, 10,  5,  5],
-    [0,  0,  0, 20, 20,  0,  0,  0],
-    [5, -5,-10,  0,  0,-10, -5,  5],
-    [5, 10, 10,-20,-20, 10, 10,  5],
-    [0,  0,  0,  0,  0,  0,  0,  0]
-]
+# Transposition table
+TT_SIZE = 1 << 20
+TT_MASK = TT_SIZE - 1
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
 
-KNIGHT_TABLE = [
-    [-50,-40,-30,-30,-30,-30,-40,-50],
-    [-40,-20,  0,  0,  0,  0,-20,-40],
-    [-30,  0, 10, 15, 15, 10,  0,-30],
-    [-30,  5, 15, 20, 20, 15,  5,-30],
-    [-30,  0, 15, 20, 20, 15,  0,-30],
-    [-30,  5, 10, 15, 15, 10,  5,-30],
-    [-40,-20,  0,  5,  5,  0,-20,-40],
-    [-50,-40,-30,-30,-30,-30,-40,-50]
-]
+# Quiet move ordering (also covers quiescence plies)
+MAX_PLY = 128
+KILLER_BONUS = 1 << 30  # Killer moves sort ahead of any history score
 
-BISHOP_TABLE = [
-    [-20,-10,-10,-10,-10,-10,-10,-20],
-    [-10,  0,  0,  0,  0,  0,  0,-10],
-    [-10,  0,  5, 10, 10,  5,  0,-10],
-    [-10,  5,  5, 10, 10,  5,  5,-10],
-    [-10,  0, 10, 10, 10, 10,  0,-10],
-    [-10, 10, 10, 10, 10, 10, 10,-10],
-    [-10,  5,  0,  0,  0,  0,  5,-10],
-    [-20,-10,-10,-10,-10,-10,-10,-20]
-]
-
-ROOK_TABLE = [
-    [0,  0,  0,  0,  0,  0,  0,  0],
-    [5, 10, 10, 10, 10, 10, 10,  5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [-5,  0,  0,  0,  0,  0,  0, -5],
-    [0,  0,  0,  5,  5,  0,  0,  0]
-]
-
-QUEEN_TABLE = [
-    [-20,-10,-10, -5, -5,-10,-10,-20],
-    [-10,  0,  0,  0,  0,  0,  0,-10],
-    [-10,  0,  5,  5,  5,  5,  0,-10],
-    [-5,  0,  5,  5,  5,  5,  0, -5],
-    [0,  0,  5,  5,  5,  5,  0, -5],
-    [-10,  5,  5,  5,  5,  5,  0,-10],
-    [-10,  0,  5,  0,  0,  0,  0,-10],
-    [-20,-10,-10, -5, -5,-10,-10,-20]
-]
-
-KING_TABLE = [
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-30,-40,-40,-50,-50,-40,-40,-30],
-    [-20,-30,-30,-40,-40,-30,-30,-20],
-    [-10,-20,-20,-20,-20,-20,-20,-10],
-    [20, 20,  0,  0,  0,  0, 20, 20],
-    [20, 30, 10,  0,  0, 10, 30, 20]
-]
-
-PIECE_TABLES = {
-    PAWN: PAWN_TABLE,
-    KNIGHT: KNIGHT_TABLE,
-    BISHOP: BISHOP_TABLE,
-    ROOK: ROOK_TABLE,
-    QUEEN: QUEEN_TABLE,
-    KING: KING_TABLE
-}
+# Null-move pruning depth reduction
+NULL_MOVE_REDUCTION = 2
 
+# Quiet moves at depth 1 are skipped when this much gain can't reach alpha
+FUTILITY_MARGIN = 200
 
 class ChessAI:
     """Simple chess AI using minimax with alpha-beta pruning."""
@@ -101,177 +39,235 @@ class ChessAI:
         self.color = color
         self.opponent_color = BLACK if color == WHITE else WHITE
         self.depth = depth
-    
-    def evaluate_board(self):
-        """Evaluate the board position. Positive = good for AI."""
-        score = 0
         
-        for row in range(8):
-            for col in range(8):
-                piece = self.board.get_piece(row, col)
-                if piece is not None:
-                    # Base piece value
-                    value = PIECE_VALUES[piece.piece_type]
-                    
-                    # Position bonus
-                    table = PIECE_TABLES.get(piece.piece_type)
-                    if table:
-                        if piece.color == WHITE:
-                            value += table[row][col]
-                        else:
-                            value += table[7 - row][col]
-                    
-                    # Add or subtract based on color
-                    if piece.color == self.color:
-                        score += value
-                    else:
-                        score -= value
+        # Transposition table: (key, depth, flag, score, best_move) per slot
+        self.tt = [None] * TT_SIZE
         
-        return score
-    
-    def get_all_moves(self, color):
-        """Get all legal moves for a color."""
-        moves = []
-        for row in range(8):
-            for col in range(8):
-                piece = self.board.get_piece(row, col)
-                if piece is not None and piece.color == color:
-                    legal_moves = self.board.get_legal_moves(row, col)
-                    for move in legal_moves:
-                        moves.append((row, col, move[0], move[1]))
-        return moves
+        # Killer moves (two slots per ply) and history[from_sq][to_sq] counters
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[0] * 64 for _ in range(64)]
     
-    def make_temp_move(self, from_row, from_col, to_row, to_col):
-        """Make a temporary move and return undo info."""
-        piece = self.board.board[from_row][from_col]
-        captured = self.board.board[to_row][to_col]
-        old_en_passant = self.board.en_passant_target
-        old_has_moved = piece.has_moved
-        
-        # Handle en passant capture
-        en_passant_captured = None
-        en_passant_pos = None
-        if piece.piece_type == PAWN and (to_row, to_col) == self.board.en_passant_target:
-            en_passant_pos = (from_row, to_col)
-            en_passant_captured = self.board.board[from_row][to_col]
-            self.board.board[from_row][to_col] = None
+    def get_all_moves(self, color, ply=None, captures_only=False):
+        """Get all legal moves for a color, captures first in MVV-LVA order.
         
-        # Handle castling
-        castling_info = None
-        if piece.piece_type == KING and abs(to_col - from_col) == 2:
-            if to_col > from_col:  # Kingside
-                rook = self.board.board[from_row][7]
-                castling_info = (from_row, 7, from_row, 5, rook, rook.has_moved)
-                self.board.board[from_row][7] = None
-                self.board.board[from_row][5] = rook
-                rook.has_moved = True
-            else:  # Queenside
-                rook = self.board.board[from_row][0]
-                castling_info = (from_row, 0, from_row, 3, rook, rook.has_moved)
-                self.board.board[from_row][0] = None
-                self.board.board[from_row][3] = rook
-                rook.has_moved = True
+        When a search ply is given, quiet moves are ordered by the killer
+        and history heuristics. With captures_only, quiet moves are dropped.
+        """
+        board = self.board
+        mailbox = board.board
+        bb = board.bb
+        ep = board.en_passant_target
+        generate_legal_moves = board.generate_legal_moves
+        captures = []
+        quiets = []
+        add_capture = captures.append
+        add_quiet = quiets.append
+        check_info = board.get_check_info(color)
+        base = 6 * COLOR_INDEX[color]
         
-        # Update en passant target
-        if piece.piece_type == PAWN and abs(to_row - from_row) == 2:
-            self.board.en_passant_target = ((from_row + to_row) // 2, from_col)
-        else:
-            self.board.en_passant_target = None
-        
-        # Make the move
-        self.board.board[to_row][to_col] = piece
-        self.board.board[from_row][from_col] = None
-        piece.has_moved = True
+        # Walk the per-type bitboards (the board's piece lists) so the
+        # attacker value is looked up once per piece type
+        for piece_type in PIECE_TYPES:
+            attacker_value = PIECE_VALUES[piece_type]
+            for sq in iter_squares(bb[base + piece_type - 1]):
+                row, col = sq >> 3, sq & 7
+                for target in generate_legal_moves(row, col, mailbox[row][col], check_info):
+                    to_row, to_col = target
+                    move = sq | (to_row * 8 + to_col) << 6
+                    victim = mailbox[to_row][to_col]
+                    if victim is not None:
+                        # Most valuable victim first, least valuable attacker breaks ties
+                        add_capture((PIECE_VALUES[victim.piece_type] * 10 - attacker_value,
+                                     move | MOVE_CAPTURE))
+                    elif piece_type == PAWN and target == ep:
+                        add_capture((PIECE_VALUES[PAWN] * 9, move | MOVE_CAPTURE | MOVE_EN_PASSANT))
+                    elif piece_type == PAWN and abs(to_row - row) == 2:
+                        add_quiet(move | MOVE_DOUBLE_PUSH)
+                    elif piece_type == KING and abs(to_col - col) == 2:
+                        add_quiet(move | MOVE_CASTLE)
+                    else:
+                        add_quiet(move)
         
-        return {
-            'piece': piece,
-            'captured': captured,
-            'from_pos': (from_row, from_col),
-            'to_pos': (to_row, to_col),
-            'old_en_passant': old_en_passant,
-            'old_has_moved': old_has_moved,
-            'en_passant_captured': en_passant_captured,
-            'en_passant_pos': en_passant_pos,
-            'castling_info': castling_info
-        }
+        captures.sort(key=lambda capture: capture[0], reverse=True)
+        if captures_only:
+            return [move for _, move in captures]
+        if ply is not None:
+            killers = self.killers[ply]
+            history = self.history
+            
+            def quiet_score(move):
+                if move == killers[0]:
+                    return KILLER_BONUS * 2
+                if move == killers[1]:
+                    return KILLER_BONUS
+                return history[move & 63][(move >> 6) & 63]
+            
+            quiets.sort(key=quiet_score, reverse=True)
+        return [move for _, move in captures] + quiets
     
-    def undo_temp_move(self, undo_info):
-        """Undo a temporary move."""
-        piece = undo_info['piece']
-        from_row, from_col = undo_info['from_pos']
-        to_row, to_col = undo_info['to_pos']
+    def negamax(self, depth, alpha, beta, color, ply=0, allow_null=True):
+        """Negamax with alpha-beta pruning and a transposition table.
         
-        # Restore piece position
-        self.board.board[from_row][from_col] = piece
-        self.board.board[to_row][to_col] = undo_info['captured']
-        piece.has_moved = undo_info['old_has_moved']
-        self.board.en_passant_target = undo_info['old_en_passant']
+        Scores are from the point of view of color, the side to move.
+        """
+        if depth == 0:
+            return self.quiesce(alpha, beta, color), None
         
-        # Restore en passant captured piece
-        if undo_info['en_passant_captured']:
-            ep_row, ep_col = undo_info['en_passant_pos']
-            self.board.board[ep_row][ep_col] = undo_info['en_passant_captured']
+        # Probe the transposition table
+        key = self.board.zobrist_key(color)
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        entry = self.tt[key & TT_MASK]
+        if entry is not None and entry[0] == key:
+            _, entry_depth, flag, score, tt_move = entry
+            if entry_depth >= depth:
+                if flag == TT_EXACT:
+                    return score, tt_move
+                elif flag == TT_LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score, tt_move
         
-        # Restore castling
-        if undo_info['castling_info']:
-            r_from_row, r_from_col, r_to_row, r_to_col, rook, old_moved = undo_info['castling_info']
-            self.board.board[r_from_col][r_from_row] = None  # Clear new position
-            self.board.board[r_to_row][r_to_col] = None
-            self.board.board[r_from_row][r_from_col] = rook
-            rook.has_moved = old_moved
-    
-    def minimax(self, depth, alpha, beta, maximizing):
-        """Minimax with alpha-beta pruning."""
-        if depth == 0:
-            return self.evaluate_board(), None
+        other = BLACK if color == WHITE else WHITE
+        in_check = self.board.is_in_check(color)
+        
+        # Null-move pruning: if passing still fails high at reduced depth,
+        # the position is good enough to cut. Skipped in check and in pawn
+        # endings, where zugzwang makes passing unsound.
+        if (allow_null and ply > 0 and depth >= NULL_MOVE_REDUCTION + 1
+                and not in_check and self.has_non_pawn_material(color)):
+            old_en_passant = self.board.en_passant_target
+            self.board.en_passant_target = None
+            score = -self.negamax(depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1,
+                                  other, ply + 1, False)[0]
+            self.board.en_passant_target = old_en_passant
+            if score >= beta:
+                return beta, None
         
-        current_color = self.color if maximizing else self.opponent_color
-        moves = self.get_all_moves(current_color)
+        moves = self.get_all_moves(color, ply)
         
         if not moves:
             # Check for checkmate or stalemate
-            if self.board.is_in_check(current_color):
-                return -100000 if maximizing else 100000, None
+            if in_check:
+                return -MATE_SCORE, None
             return 0, None  # Stalemate
         
+        # Futility pruning: at the frontier, a quiet move can't lift a
+        # position this far below alpha, so only captures are searched
+        futility_score = None
+        if depth == 1 and not in_check:
+            static_score = self.board.static_eval if color == WHITE else -self.board.static_eval
+            futility_score = static_score + FUTILITY_MARGIN
+            if futility_score > alpha:
+                futility_score = None
+        
+        # Search the stored best move first
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        
+        best_score = float('-inf')
         best_move = None
+        make_temp_move = self.board.make_temp_move
+        undo_temp_move = self.board.undo_temp_move
+        for i, move in enumerate(moves):
+            if futility_score is not None and best_move is not None and not move & MOVE_CAPTURE:
+                best_score = max(best_score, futility_score)
+                continue
+            make_temp_move(move)
+            if i == 0:
+                score = -self.negamax(depth - 1, -beta, -alpha, other, ply + 1)[0]
+            else:
+                # Principal variation search: prove the move is no better than
+                # alpha with a zero-width window, re-search only if it is
+                score = -self.negamax(depth - 1, -alpha - 1, -alpha, other, ply + 1)[0]
+                if alpha < score < beta:
+                    score = -self.negamax(depth - 1, -beta, -score, other, ply + 1)[0]
+            undo_temp_move()
+            
+            if score > best_score:
+                best_score = score
+                best_move = move
+            
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.record_cutoff(move, depth, ply)
+                break
         
-        if maximizing:
-            max_eval = float('-inf')
-            for move in moves:
-                undo = self.make_temp_move(*move)
-                eval_score, _ = self.minimax(depth - 1, alpha, beta, False)
-                self.undo_temp_move(undo)
-                
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = move
-                
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
+        self.store_tt(key, depth, best_score, best_move, alpha_orig, beta_orig)
+        return best_score, best_move
+    
+    def has_non_pawn_material(self, color):
+        """Check if color has any knights, bishops, rooks or queens left."""
+        base = 6 * COLOR_INDEX[color]
+        bb = self.board.bb
+        return bool(bb[base + KNIGHT - 1] | bb[base + BISHOP - 1]
+                    | bb[base + ROOK - 1] | bb[base + QUEEN - 1])
+    
+    def quiesce(self, alpha, beta, color):
+        """Search captures only until the position is quiet.
+        
+        The static evaluation acts as a "stand pat" bound, since the side
+        to move can usually decline to capture.
+        """
+        best = self.board.static_eval if color == WHITE else -self.board.static_eval
+        if best >= beta:
+            return best
+        alpha = max(alpha, best)
+        
+        other = BLACK if color == WHITE else WHITE
+        for move in self.get_all_moves(color, captures_only=True):
+            self.board.make_temp_move(move)
+            score = -self.quiesce(-beta, -alpha, other)
+            self.board.undo_temp_move()
             
-            return max_eval, best_move
+            if score > best:
+                best = score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        
+        return best
+    
+    def record_cutoff(self, move, depth, ply):
+        """Update the killer and history tables after a quiet move causes a cutoff."""
+        if move & MOVE_CAPTURE:
+            return
+        
+        killers = self.killers[ply]
+        if move != killers[0]:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[move & 63][(move >> 6) & 63] += depth * depth
+    
+    def store_tt(self, key, depth, score, best_move, alpha, beta):
+        """Store a search result, flagged by where it fell in the (alpha, beta) window."""
+        if score <= alpha:
+            flag = TT_UPPER
+        elif score >= beta:
+            flag = TT_LOWER
         else:
-            min_eval = float('inf')
-            for move in moves:
-                undo = self.make_temp_move(*move)
-                eval_score, _ = self.minimax(depth - 1, alpha, beta, True)
-                self.undo_temp_move(undo)
-                
-                if eval_score < min_eval:
-                    min_eval = eval_score
-                    best_move = move
-                
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            
-            return min_eval, best_move
+            flag = TT_EXACT
+        self.tt[key & TT_MASK] = (key, depth, flag, score, best_move)
     
     def get_best_move(self):
-        """Get the best move for the AI."""
-        _, best_move = self.minimax(self.depth, float('-inf'), float('inf'), True)
+        """Get the best move for the AI using iterative deepening.
+        
+        Each shallower search seeds the transposition table, killer and
+        history tables so the deeper searches are better ordered.
+        """
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[0] * 64 for _ in range(64)]
+        
+        best_move = None
+        for depth in range(1, self.depth + 1):
+            score, move = self.negamax(depth, float('-inf'), float('inf'), self.color)
+            if move is not None:
+                best_move = move
+            if abs(score) > MATE_THRESHOLD:
+                break  # Forced mate found, searching deeper won't change it
         
         if best_move is None:
             # Fallback: pick a random legal move
@@ -279,4 +275,4 @@ class ChessAI:
             if moves:
                 best_move = random.choice(moves)
         
-        return best_move
+        return decode_move(best_move) if best_move is not None else None
@@ -2,18 +2,376 @@
 Board class handling chess board state and move logic.
 """
 
+import random
 from constants import (
     PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, BLACK
 )
 from piece import Piece
 
 
+# Bitboards are indexed by 6 * COLOR_INDEX[color] + piece_type - 1.
+# Square index is row * 8 + col, so bit 0 is a8 and bit 63 is h1.
+COLOR_INDEX = {WHITE: 0, BLACK: 1}
+PIECE_TYPES = (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING)
+
+KNIGHT_DELTAS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                 (1, -2), (1, 2), (2, -1), (2, 1)]
+KING_DELTAS = [(-1, -1), (-1, 0), (-1, 1), (0, -1),
+               (0, 1), (1, -1), (1, 0), (1, 1)]
+BISHOP_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def bb_index(piece_type, color):
+    """Get the bitboard index for a piece type and color."""
+    return 6 * COLOR_INDEX[color] + piece_type - 1
+
+
+def iter_squares(bb):
+    """Yield the square index of every set bit in a bitboard."""
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+def _build_step_attacks(deltas):
+    """Build a 64-entry attack table for a non-sliding piece."""
+    table = [0] * 64
+    for row in range(8):
+        for col in range(8):
+            for dr, dc in deltas:
+                r, c = row + dr, col + dc
+                if 0 <= r < 8 and 0 <= c < 8:
+                    table[row * 8 + col] |= 1 << (r * 8 + c)
+    return table
+
+
+def _build_rays(dr, dc):
+    """Build a 64-entry table of rays from each square in one direction."""
+    table = [0] * 64
+    for row in range(8):
+        for col in range(8):
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                table[row * 8 + col] |= 1 << (r * 8 + c)
+                r += dr
+                c += dc
+    return table
+
+
+KNIGHT_ATTACKS = _build_step_attacks(KNIGHT_DELTAS)
+KING_ATTACKS = _build_step_attacks(KING_DELTAS)
+PAWN_ATTACKS = [
+    _build_step_attacks([(-1, -1), (-1, 1)]),  # White pawns capture upwards
+    _build_step_attacks([(1, -1), (1, 1)])     # Black pawns capture downwards
+]
+PAWN_PUSHES = [_build_step_attacks([(-1, 0)]), _build_step_attacks([(1, 0)])]
+PAWN_DOUBLE_PUSHES = [
+    [bb if sq >> 3 == 6 else 0 for sq, bb in enumerate(_build_step_attacks([(-2, 0)]))],
+    [bb if sq >> 3 == 1 else 0 for sq, bb in enumerate(_build_step_attacks([(2, 0)]))]
+]
+
+# Rays per direction; "positive" rays run towards higher square indices, so
+# the nearest blocker is the lowest set bit, otherwise the highest.
+RAYS = {d: _build_rays(*d) for d in BISHOP_DIRECTIONS + ROOK_DIRECTIONS}
+POSITIVE_DIRECTIONS = {d for d in RAYS if d[0] * 8 + d[1] > 0}
+
+
+def _build_between():
+    """Build BETWEEN[a][b]: the squares strictly between two aligned squares."""
+    table = [[0] * 64 for _ in range(64)]
+    for row in range(8):
+        for col in range(8):
+            for dr, dc in RAYS:
+                r, c = row + dr, col + dc
+                squares = 0
+                while 0 <= r < 8 and 0 <= c < 8:
+                    table[row * 8 + col][r * 8 + c] = squares
+                    squares |= 1 << (r * 8 + c)
+                    r += dr
+                    c += dc
+    return table
+
+
+BETWEEN = _build_between()
+ALL_SQUARES = (1 << 64) - 1
+
+# (ray table, is positive) pairs, so slider scans need no per-call lookups
+BISHOP_RAYS = [(RAYS[d], d in POSITIVE_DIRECTIONS) for d in BISHOP_DIRECTIONS]
+ROOK_RAYS = [(RAYS[d], d in POSITIVE_DIRECTIONS) for d in ROOK_DIRECTIONS]
+QUEEN_RAYS = BISHOP_RAYS + ROOK_RAYS
+
+
+def sliding_attacks(sq, occ, rays):
+    """Get the attack bitboard of a slider on sq by walking its rays."""
+    attacks = 0
+    for table, positive in rays:
+        ray = table[sq]
+        blockers = ray & occ
+        if blockers:
+            if positive:
+                ray ^= table[(blockers & -blockers).bit_length() - 1]
+            else:
+                ray ^= table[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def _build_slider_tables(rays):
+    """Build relevant-occupancy masks and attack tables for a slider.
+    
+    Like magic bitboards, the mask keeps only the blockers that matter
+    (board edges never block); the Python dict plays the role of the
+    magic multiply + shift as a perfect hash from masked occupancy to
+    the attack set.
+    """
+    masks = []
+    tables = []
+    for sq in range(64):
+        mask = 0
+        for table, positive in rays:
+            ray = table[sq]
+            if ray:
+                edge = (ray.bit_length() - 1) if positive else ((ray & -ray).bit_length() - 1)
+                mask |= ray & ~(1 << edge)
+        
+        # Enumerate every subset of the mask (Carry-Rippler trick)
+        attacks = {}
+        subset = 0
+        while True:
+            attacks[subset] = sliding_attacks(sq, subset, rays)
+            subset = (subset - mask) & mask
+            if subset == 0:
+                break
+        masks.append(mask)
+        tables.append(attacks)
+    return masks, tables
+
+
+BISHOP_MASKS, BISHOP_TABLES = _build_slider_tables(BISHOP_RAYS)
+ROOK_MASKS, ROOK_TABLES = _build_slider_tables(ROOK_RAYS)
+
+
+def bishop_attacks(sq, occ):
+    """Get bishop attacks from sq given the occupancy."""
+    return BISHOP_TABLES[sq][occ & BISHOP_MASKS[sq]]
+
+
+def rook_attacks(sq, occ):
+    """Get rook attacks from sq given the occupancy."""
+    return ROOK_TABLES[sq][occ & ROOK_MASKS[sq]]
+
+
+def queen_attacks(sq, occ):
+    """Get queen attacks from sq given the occupancy."""
+    return (BISHOP_TABLES[sq][occ & BISHOP_MASKS[sq]]
+            | ROOK_TABLES[sq][occ & ROOK_MASKS[sq]])
+
+
+def attackers_to(bb, occ, sq, attacker):
+    """Get the bitboard of attacker's (a COLOR_INDEX) pieces attacking sq."""
+    base = 6 * attacker
+    queens = bb[base + QUEEN - 1]
+    return ((PAWN_ATTACKS[1 - attacker][sq] & bb[base + PAWN - 1])
+            | (KNIGHT_ATTACKS[sq] & bb[base + KNIGHT - 1])
+            | (KING_ATTACKS[sq] & bb[base + KING - 1])
+            | (BISHOP_TABLES[sq][occ & BISHOP_MASKS[sq]] & (bb[base + BISHOP - 1] | queens))
+            | (ROOK_TABLES[sq][occ & ROOK_MASKS[sq]] & (bb[base + ROOK - 1] | queens)))
+
+
+def is_attacked(bb, occ, sq, defender):
+    """Check if sq is attacked by the opponent of defender (a COLOR_INDEX).
+    
+    Works on the raw bitboard list only, without a Board or Piece objects,
+    so hot search code can call it directly. This is attackers_to with an
+    early exit on the first attacking piece type found.
+    """
+    base = 6 * (1 - defender)  # Bitboard offset of the attacking color
+    
+    # A pawn of the defending color on sq attacks exactly the squares
+    # from which an enemy pawn would attack sq
+    if PAWN_ATTACKS[defender][sq] & bb[base + PAWN - 1]:
+        return True
+    if KNIGHT_ATTACKS[sq] & bb[base + KNIGHT - 1]:
+        return True
+    if KING_ATTACKS[sq] & bb[base + KING - 1]:
+        return True
+    
+    # Only look up slider attacks when the opponent has sliders of that kind
+    queens = bb[base + QUEEN - 1]
+    diagonal = bb[base + BISHOP - 1] | queens
+    if diagonal and BISHOP_TABLES[sq][occ & BISHOP_MASKS[sq]] & diagonal:
+        return True
+    straight = bb[base + ROOK - 1] | queens
+    if straight and ROOK_TABLES[sq][occ & ROOK_MASKS[sq]] & straight:
+        return True
+    return False
+
+
+# Piece values for evaluation
+PIECE_VALUES = {
+    PAWN: 100,
+    KNIGHT: 320,
+    BISHOP: 330,
+    ROOK: 500,
+    QUEEN: 900,
+    KING: 20000
+}
+
+# Position bonuses for pieces (encourages good piece placement)
+PAWN_TABLE = [
+    [0,  0,  0,  0,  0,  0,  0,  0],
+    [50, 50, 50, 50, 50, 50, 50, 50],
+    [10, 10, 20, 30, 30, 20, 10, 10],
+    [5,  5, 10, 25, 25, 10,  5,  5],
+    [0,  0,  0, 20, 20,  0,  0,  0],
+    [5, -5,-10,  0,  0,-10, -5,  5],
+    [5, 10, 10,-20,-20, 10, 10,  5],
+    [0,  0,  0,  0,  0,  0,  0,  0]
+]
+
+KNIGHT_TABLE = [
+    [-50,-40,-30,-30,-30,-30,-40,-50],
+    [-40,-20,  0,  0,  0,  0,-20,-40],
+    [-30,  0, 10, 15, 15, 10,  0,-30],
+    [-30,  5, 15, 20, 20, 15,  5,-30],
+    [-30,  0, 15, 20, 20, 15,  0,-30],
+    [-30,  5, 10, 15, 15, 10,  5,-30],
+    [-40,-20,  0,  5,  5,  0,-20,-40],
+    [-50,-40,-30,-30,-30,-30,-40,-50]
+]
+
+BISHOP_TABLE = [
+    [-20,-10,-10,-10,-10,-10,-10,-20],
+    [-10,  0,  0,  0,  0,  0,  0,-10],
+    [-10,  0,  5, 10, 10,  5,  0,-10],
+    [-10,  5,  5, 10, 10,  5,  5,-10],
+    [-10,  0, 10, 10, 10, 10,  0,-10],
+    [-10, 10, 10, 10, 10, 10, 10,-10],
+    [-10,  5,  0,  0,  0,  0,  5,-10],
+    [-20,-10,-10,-10,-10,-10,-10,-20]
+]
+
+ROOK_TABLE = [
+    [0,  0,  0,  0,  0,  0,  0,  0],
+    [5, 10, 10, 10, 10, 10, 10,  5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [-5,  0,  0,  0,  0,  0,  0, -5],
+    [0,  0,  0,  5,  5,  0,  0,  0]
+]
+
+QUEEN_TABLE = [
+    [-20,-10,-10, -5, -5,-10,-10,-20],
+    [-10,  0,  0,  0,  0,  0,  0,-10],
+    [-10,  0,  5,  5,  5,  5,  0,-10],
+    [-5,  0,  5,  5,  5,  5,  0, -5],
+    [0,  0,  5,  5,  5,  5,  0, -5],
+    [-10,  5,  5,  5,  5,  5,  0,-10],
+    [-10,  0,  5,  0,  0,  0,  0,-10],
+    [-20,-10,-10, -5, -5,-10,-10,-20]
+]
+
+KING_TABLE = [
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-30,-40,-40,-50,-50,-40,-40,-30],
+    [-20,-30,-30,-40,-40,-30,-30,-20],
+    [-10,-20,-20,-20,-20,-20,-20,-10],
+    [20, 20,  0,  0,  0,  0, 20, 20],
+    [20, 30, 10,  0,  0, 10, 30, 20]
+]
+
+PIECE_TABLES = {
+    PAWN: PAWN_TABLE,
+    KNIGHT: KNIGHT_TABLE,
+    BISHOP: BISHOP_TABLE,
+    ROOK: ROOK_TABLE,
+    QUEEN: QUEEN_TABLE,
+    KING: KING_TABLE
+}
+
+
+def _build_pst_full():
+    """Fold piece values into the piece-square tables, indexed [bb_index][sq]."""
+    tables = []
+    for color in (WHITE, BLACK):
+        for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            value = PIECE_VALUES[piece_type]
+            table = PIECE_TABLES[piece_type]
+            if color == WHITE:
+                tables.append([value + table[sq >> 3][sq & 7] for sq in range(64)])
+            else:
+                tables.append([value + table[7 - (sq >> 3)][sq & 7] for sq in range(64)])
+    return tables
+
+
+PST_FULL = _build_pst_full()
+
+# White-relative PST_FULL (black's tables negated) for the incremental score
+PST_SIGNED = PST_FULL[:6] + [[-value for value in table] for table in PST_FULL[6:]]
+
+
+# Zobrist keys for hashing positions (fixed seed keeps hashes reproducible)
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST_PIECE = [[_zobrist_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+ZOBRIST_EP = [_zobrist_rng.getrandbits(64) for _ in range(8)]
+ZOBRIST_CASTLE = [_zobrist_rng.getrandbits(64) for _ in range(16)]  # One per rights mask
+ZOBRIST_STM = _zobrist_rng.getrandbits(64)  # XORed in when black is to move
+
+# Castling rights bits: (row, rook column, color) for K, Q, k, q
+CASTLING_SQUARES = [(7, 7, WHITE), (7, 0, WHITE), (0, 7, BLACK), (0, 0, BLACK)]
+
+
+# Temporary moves are packed into one int: from_sq | to_sq << 6 | flags << 12
+MOVE_CAPTURE = 1 << 12
+MOVE_EN_PASSANT = 2 << 12
+MOVE_CASTLE = 4 << 12
+MOVE_DOUBLE_PUSH = 8 << 12
+MAX_UNDO_DEPTH = 128  # Temporary moves that can be stacked at once
+
+
+def decode_move(move):
+    """Unpack a move int into a (from_row, from_col, to_row, to_col) tuple."""
+    return (move >> 3) & 7, move & 7, (move >> 9) & 7, (move >> 6) & 7
+
+
 class Board:
-    """Handles chess board state and move generation."""
+    """Handles chess board state and move generation.
+    
+    Pieces are stored both in an 8x8 mailbox (self.board) for O(1) lookups
+    and in 12 bitboards plus occupancy masks for fast attack detection.
+    All changes to the board must go through set_piece to keep them in sync,
+    along with the white-relative material + position score and the Zobrist
+    key of the piece placement.
+    """
     
     def __init__(self):
         self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.bb = [0] * 12
+        self.occ_w = 0
+        self.occ_b = 0
+        self.occ = 0
+        self.score = 0
+        self.piece_key = 0
         self.en_passant_target = None
+        
+        # Undo frames for temporary moves, indexed by self.ply
+        self.undo_stack = [None] * MAX_UNDO_DEPTH
+        self.ply = 0
+        
+        self.move_generators = {
+            PAWN: self.get_pawn_moves,
+            KNIGHT: self.get_knight_moves,
+            BISHOP: self.get_bishop_moves,
+            ROOK: self.get_rook_moves,
+            QUEEN: self.get_queen_moves,
+            KING: self.get_king_moves
+        }
         self.setup_board()
     
     def setup_board(self):
@@ -22,13 +380,71 @@ class Board:
         
         # Black pieces (rows 0 and 1)
         for col in range(8):
-            self.board[0][col] = Piece(back_row[col], BLACK)
-            self.board[1][col] = Piece(PAWN, BLACK)
+            self.set_piece(0, col, Piece(back_row[col], BLACK))
+            self.set_piece(1, col, Piece(PAWN, BLACK))
         
         # White pieces (rows 6 and 7)
         for col in range(8):
-            self.board[6][col] = Piece(PAWN, WHITE)
-            self.board[7][col] = Piece(back_row[col], WHITE)
+            self.set_piece(6, col, Piece(PAWN, WHITE))
+            self.set_piece(7, col, Piece(back_row[col], WHITE))
+    
+    def set_piece(self, row, col, piece):
+        """Place a piece (or None) on a square, updating the bitboards, score and key."""
+        sq = row * 8 + col
+        bit = 1 << sq
+        old = self.board[row][col]
+        if old is not None:
+            index = old.index
+            self.bb[index] ^= bit
+            self.score -= PST_SIGNED[index][sq]
+            self.piece_key ^= ZOBRIST_PIECE[index][sq]
+            if old.color == WHITE:
+                self.occ_w ^= bit
+            else:
+                self.occ_b ^= bit
+        
+        self.board[row][col] = piece
+        if piece is not None:
+            index = piece.index
+            self.bb[index] |= bit
+            self.score += PST_SIGNED[index][sq]
+            self.piece_key ^= ZOBRIST_PIECE[index][sq]
+            if piece.color == WHITE:
+                self.occ_w |= bit
+            else:
+                self.occ_b |= bit
+        
+        self.occ = self.occ_w | self.occ_b
+    
+    @property
+    def static_eval(self):
+        """Material + position score of the board. Positive = good for white."""
+        return self.score
+    
+    def castling_rights(self):
+        """Get a 4-bit mask of the castling rights still available."""
+        rights = 0
+        for i, (row, rook_col, color) in enumerate(CASTLING_SQUARES):
+            king = self.board[row][4]
+            rook = self.board[row][rook_col]
+            if (king is not None and king.piece_type == KING and king.color == color
+                    and not king.has_moved and rook is not None and rook.piece_type == ROOK
+                    and rook.color == color and not rook.has_moved):
+                rights |= 1 << i
+        return rights
+    
+    def zobrist_key(self, color_to_move):
+        """Get the Zobrist key of the position with color_to_move to play.
+        
+        The piece placement part is kept incrementally by set_piece, so this
+        only folds in en passant, castling rights and the side to move.
+        """
+        key = self.piece_key ^ ZOBRIST_CASTLE[self.castling_rights()]
+        if self.en_passant_target is not None:
+            key ^= ZOBRIST_EP[self.en_passant_target[1]]
+        if color_to_move == BLACK:
+            key ^= ZOBRIST_STM
+        return key
     
     def get_piece(self, row, col):
         """Get piece at given position."""
@@ -40,120 +456,79 @@ class Board:
         """Check if position is within board bounds."""
         return 0 <= row < 8 and 0 <= col < 8
     
+    def own_occupancy(self, color):
+        """Get the occupancy bitboard for the given color."""
+        return self.occ_w if color == WHITE else self.occ_b
+    
+    def targets_to_moves(self, targets):
+        """Convert a target bitboard to a list of (row, col) moves."""
+        moves = []
+        append = moves.append
+        while targets:
+            lsb = targets & -targets
+            sq = lsb.bit_length() - 1
+            append((sq >> 3, sq & 7))
+            targets ^= lsb
+        return moves
+    
     def get_raw_moves(self, row, col):
         """Get all possible moves for a piece without considering check."""
         piece = self.get_piece(row, col)
         if piece is None:
             return []
         
-        if piece.piece_type == PAWN:
-            return self.get_pawn_moves(row, col, piece)
-        elif piece.piece_type == KNIGHT:
-            return self.get_knight_moves(row, col, piece)
-        elif piece.piece_type == BISHOP:
-            return self.get_bishop_moves(row, col, piece)
-        elif piece.piece_type == ROOK:
-            return self.get_rook_moves(row, col, piece)
-        elif piece.piece_type == QUEEN:
-            return self.get_queen_moves(row, col, piece)
-        elif piece.piece_type == KING:
-            return self.get_king_moves(row, col, piece)
-        return []
-    
-    def get_pawn_moves(self, row, col, piece):
-        """Get pawn moves including en passant."""
-        moves = []
-        direction = -1 if piece.color == WHITE else 1
-        start_row = 6 if piece.color == WHITE else 1
-        
-        # Forward move
-        new_row = row + direction
-        if self.is_valid_position(new_row, col) and self.board[new_row][col] is None:
-            moves.append((new_row, col))
-            
-            # Double move from starting position
-            if row == start_row:
-                new_row2 = row + 2 * direction
-                if self.board[new_row2][col] is None:
-                    moves.append((new_row2, col))
+        return self.move_generators[piece.piece_type](row, col, piece)
+    
+    def get_pawn_moves(self, row, col, piece, allowed=ALL_SQUARES):
+        """Get pawn moves including en passant.
+        
+        Targets are restricted to allowed, except for en passant, which
+        callers must check separately.
+        """
+        sq = row * 8 + col
+        color = piece.color
+        color_index = COLOR_INDEX[color]
+        empty = ~self.occ
+        ep = self.en_passant_target
+        
+        # Forward move, and double move from starting position
+        targets = PAWN_PUSHES[color_index][sq] & empty
+        if targets:
+            targets |= PAWN_DOUBLE_PUSHES[color_index][sq] & empty
         
         # Diagonal captures
-        for dc in [-1, 1]:
-            new_col = col + dc
-            if self.is_valid_position(new_row, new_col):
-                target = self.board[new_row][new_col]
-                if target is not None and target.color != piece.color:
-                    moves.append((new_row, new_col))
-                elif (new_row, new_col) == self.en_passant_target:
-                    moves.append((new_row, new_col))
+        attacks = PAWN_ATTACKS[color_index][sq]
+        enemy_occ = self.occ_b if color == WHITE else self.occ_w
+        targets = (targets | attacks & enemy_occ) & allowed
+        if ep is not None:
+            targets |= attacks & (1 << (ep[0] * 8 + ep[1]))
         
-        return moves
+        return self.targets_to_moves(targets)
     
-    def get_knight_moves(self, row, col, piece):
+    def get_knight_moves(self, row, col, piece, allowed=ALL_SQUARES):
         """Get knight moves."""
-        moves = []
-        deltas = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
-                  (1, -2), (1, 2), (2, -1), (2, 1)]
-        
-        for dr, dc in deltas:
-            new_row, new_col = row + dr, col + dc
-            if self.is_valid_position(new_row, new_col):
-                target = self.board[new_row][new_col]
-                if target is None or target.color != piece.color:
-                    moves.append((new_row, new_col))
-        
-        return moves
-    
-    def get_sliding_moves(self, row, col, piece, directions):
-        """Get moves for sliding pieces (bishop, rook, queen)."""
-        moves = []
-        
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            while self.is_valid_position(new_row, new_col):
-                target = self.board[new_row][new_col]
-                if target is None:
-                    moves.append((new_row, new_col))
-                elif target.color != piece.color:
-                    moves.append((new_row, new_col))
-                    break
-                else:
-                    break
-                new_row += dr
-                new_col += dc
-        
-        return moves
+        targets = KNIGHT_ATTACKS[row * 8 + col] & ~self.own_occupancy(piece.color)
+        return self.targets_to_moves(targets & allowed)
     
-    def get_bishop_moves(self, row, col, piece):
+    def get_bishop_moves(self, row, col, piece, allowed=ALL_SQUARES):
         """Get bishop moves."""
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        return self.get_sliding_moves(row, col, piece, directions)
+        attacks = bishop_attacks(row * 8 + col, self.occ)
+        return self.targets_to_moves(attacks & ~self.own_occupancy(piece.color) & allowed)
     
-    def get_rook_moves(self, row, col, piece):
+    def get_rook_moves(self, row, col, piece, allowed=ALL_SQUARES):
         """Get rook moves."""
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        return self.get_sliding_moves(row, col, piece, directions)
+        attacks = rook_attacks(row * 8 + col, self.occ)
+        return self.targets_to_moves(attacks & ~self.own_occupancy(piece.color) & allowed)
     
-    def get_queen_moves(self, row, col, piece):
+    def get_queen_moves(self, row, col, piece, allowed=ALL_SQUARES):
         """Get queen moves."""
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1),
-                      (-1, 0), (1, 0), (0, -1), (0, 1)]
-        return self.get_sliding_moves(row, col, piece, directions)
+        attacks = queen_attacks(row * 8 + col, self.occ)
+        return self.targets_to_moves(attacks & ~self.own_occupancy(piece.color) & allowed)
     
     def get_king_moves(self, row, col, piece):
         """Get king moves including castling."""
-        moves = []
-        
-        # Regular moves
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                new_row, new_col = row + dr, col + dc
-                if self.is_valid_position(new_row, new_col):
-                    target = self.board[new_row][new_col]
-                    if target is None or target.color != piece.color:
-                        moves.append((new_row, new_col))
+        targets = KING_ATTACKS[row * 8 + col] & ~self.own_occupancy(piece.color)
+        moves = self.targets_to_moves(targets)
         
         # Castling
         if not piece.has_moved and not self.is_square_attacked(row, col, piece.color):
@@ -198,40 +573,22 @@ class Board:
     
     def is_square_attacked(self, row, col, defending_color):
         """Check if a square is attacked by the opponent."""
-        attacking_color = BLACK if defending_color == WHITE else WHITE
-        
-        for r in range(8):
-            for c in range(8):
-                piece = self.board[r][c]
-                if piece is not None and piece.color == attacking_color:
-                    if piece.piece_type == KING:
-                        for dr in [-1, 0, 1]:
-                            for dc in [-1, 0, 1]:
-                                if dr == 0 and dc == 0:
-                                    continue
-                                if r + dr == row and c + dc == col:
-                                    return True
-                    else:
-                        moves = self.get_raw_moves(r, c)
-                        if (row, col) in moves:
-                            return True
-        return False
+        return is_attacked(self.bb, self.occ, row * 8 + col, COLOR_INDEX[defending_color])
     
     def find_king(self, color):
         """Find the position of the king."""
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece is not None and piece.piece_type == KING and piece.color == color:
-                    return (row, col)
-        return None
+        kings = self.bb[bb_index(KING, color)]
+        if not kings:
+            return None
+        sq = (kings & -kings).bit_length() - 1
+        return (sq >> 3, sq & 7)
     
     def is_in_check(self, color):
         """Check if the given color's king is in check."""
-        king_pos = self.find_king(color)
-        if king_pos is None:
+        kings = self.bb[bb_index(KING, color)]
+        if not kings:
             return False
-        return self.is_square_attacked(king_pos[0], king_pos[1], color)
+        return is_attacked(self.bb, self.occ, kings.bit_length() - 1, COLOR_INDEX[color])
     
     def is_move_legal(self, from_row, from_col, to_row, to_col):
         """Check if a move is legal (doesn't leave king in check)."""
@@ -240,37 +597,109 @@ class Board:
         
         en_passant_capture = None
         if piece.piece_type == PAWN and (to_row, to_col) == self.en_passant_target:
-            en_passant_row = from_row
-            en_passant_capture = self.board[en_passant_row][to_col]
-            self.board[en_passant_row][to_col] = None
+            en_passant_capture = self.board[from_row][to_col]
+            self.set_piece(from_row, to_col, None)
         
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = None
+        self.set_piece(to_row, to_col, piece)
+        self.set_piece(from_row, from_col, None)
         
         in_check = self.is_in_check(piece.color)
         
-        self.board[from_row][from_col] = piece
-        self.board[to_row][to_col] = captured
+        self.set_piece(from_row, from_col, piece)
+        self.set_piece(to_row, to_col, captured)
         
         if en_passant_capture is not None:
-            self.board[en_passant_row][to_col] = en_passant_capture
+            self.set_piece(from_row, to_col, en_passant_capture)
         
         return not in_check
     
+    def get_check_info(self, color):
+        """Find the pieces checking color's king and the pieces pinned to it.
+        
+        Returns (king_sq, checkers, pins) where checkers is a bitboard and
+        pins maps each pinned square to the ray it may still move along
+        (the squares up to and including the pinning piece).
+        """
+        kings = self.bb[bb_index(KING, color)]
+        if not kings:
+            return None, 0, {}
+        king_sq = (kings & -kings).bit_length() - 1
+        
+        defender = COLOR_INDEX[color]
+        base = 6 * (1 - defender)
+        bb = self.bb
+        occ = self.occ
+        own_occ = self.own_occupancy(color)
+        queens = bb[base + QUEEN - 1]
+        diagonal = bb[base + BISHOP - 1] | queens
+        straight = bb[base + ROOK - 1] | queens
+        
+        checkers = attackers_to(bb, occ, king_sq, 1 - defender)
+        
+        pins = {}
+        for attacks, sliders in ((bishop_attacks, diagonal), (rook_attacks, straight)):
+            if not sliders:
+                continue
+            direct = attacks(king_sq, occ)
+            
+            # Remove our first blockers and look for enemy sliders behind them
+            xray = attacks(king_sq, occ ^ (direct & own_occ)) & sliders & ~direct
+            for pinner in iter_squares(xray):
+                between = BETWEEN[king_sq][pinner]
+                pinned = between & own_occ
+                pins[pinned.bit_length() - 1] = between | (1 << pinner)
+        
+        return king_sq, checkers, pins
+    
+    def get_legal_mask(self, sq, check_info):
+        """Get the squares a non-king piece on sq may legally move to.
+        
+        En passant is not covered, since it removes a second piece.
+        """
+        king_sq, checkers, pins = check_info
+        if checkers & (checkers - 1):
+            return 0  # Double check: only king moves can be legal
+        
+        allowed = ALL_SQUARES
+        if checkers:
+            # Capture the checker or block between it and the king
+            allowed = BETWEEN[king_sq][checkers.bit_length() - 1] | checkers
+        if sq in pins:
+            allowed &= pins[sq]
+        return allowed
+    
+    def filter_king_moves(self, row, col, piece, moves):
+        """Drop king moves onto attacked squares, including ones only hidden behind the king."""
+        occ = self.occ & ~(1 << (row * 8 + col))
+        defender = COLOR_INDEX[piece.color]
+        return [move for move in moves
+                if not is_attacked(self.bb, occ, move[0] * 8 + move[1], defender)]
+    
+    def generate_legal_moves(self, row, col, piece, check_info):
+        """Generate legal moves for a piece, masking targets before building the list."""
+        piece_type = piece.piece_type
+        if piece_type == KING:
+            return self.filter_king_moves(row, col, piece, self.get_king_moves(row, col, piece))
+        
+        allowed = self.get_legal_mask(row * 8 + col, check_info)
+        if not allowed:
+            return []
+        moves = self.move_generators[piece_type](row, col, piece, allowed)
+        
+        # En passant bypasses the mask; test it directly
+        ep = self.en_passant_target
+        if (piece_type == PAWN and ep is not None and ep in moves
+                and not self.is_move_legal(row, col, ep[0], ep[1])):
+            moves.remove(ep)
+        return moves
+    
     def get_legal_moves(self, row, col):
         """Get all legal moves for a piece (considering check)."""
         piece = self.get_piece(row, col)
         if piece is None:
             return []
         
-        raw_moves = self.get_raw_moves(row, col)
-        legal_moves = []
-        
-        for move in raw_moves:
-            if self.is_move_legal(row, col, move[0], move[1]):
-                legal_moves.append(move)
-        
-        return legal_moves
+        return self.generate_legal_moves(row, col, piece, self.get_check_info(piece.color))
     
     def make_move(self, from_row, from_col, to_row, to_col):
         """Make a move on the board. Returns True if it was a capture."""
@@ -280,20 +709,20 @@ class Board:
         
         # Handle en passant capture
         if piece.piece_type == PAWN and (to_row, to_col) == self.en_passant_target:
-            self.board[from_row][to_col] = None
+            self.set_piece(from_row, to_col, None)
             is_capture = True
         
         # Handle castling
         if piece.piece_type == KING and abs(to_col - from_col) == 2:
             if to_col > from_col:  # Kingside
                 rook = self.board[from_row][7]
-                self.board[from_row][7] = None
-                self.board[from_row][5] = rook
+                self.set_piece(from_row, 7, None)
+                self.set_piece(from_row, 5, rook)
                 rook.has_moved = True
             else:  # Queenside
                 rook = self.board[from_row][0]
-                self.board[from_row][0] = None
-                self.board[from_row][3] = rook
+                self.set_piece(from_row, 0, None)
+                self.set_piece(from_row, 3, rook)
                 rook.has_moved = True
         
         # Update en passant target
@@ -303,30 +732,124 @@ class Board:
             self.en_passant_target = None
         
         # Make the move
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = None
+        self.set_piece(to_row, to_col, piece)
+        self.set_piece(from_row, from_col, None)
         piece.has_moved = True
         
         # Handle pawn promotion
         if piece.piece_type == PAWN:
             if (piece.color == WHITE and to_row == 0) or (piece.color == BLACK and to_row == 7):
-                self.board[to_row][to_col] = Piece(QUEEN, piece.color)
-                self.board[to_row][to_col].has_moved = True
+                queen = Piece(QUEEN, piece.color)
+                queen.has_moved = True
+                self.set_piece(to_row, to_col, queen)
         
         return is_capture
     
-    def has_legal_moves(self, color):
-        """Check if the given color has any legal moves."""
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece is not None and piece.color == color:
-                    if len(self.get_legal_moves(row, col)) > 0:
-                        return True
+    def make_temp_move(self, move):
+        """Make a temporary move, pushing its undo frame on the undo stack.
+        
+        move is a packed move int (see MOVE_CAPTURE). Unlike make_move this
+        never promotes, and it must be reverted with undo_temp_move.
+        """
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        from_row, from_col = from_sq >> 3, from_sq & 7
+        to_row, to_col = to_sq >> 3, to_sq & 7
+        piece = self.board[from_row][from_col]
+        captured = self.board[to_row][to_col]
+        old_en_passant = self.en_passant_target
+        old_has_moved = piece.has_moved
+        
+        # Handle en passant capture
+        en_passant_captured = None
+        en_passant_pos = None
+        if move & MOVE_EN_PASSANT:
+            en_passant_pos = (from_row, to_col)
+            en_passant_captured = self.board[from_row][to_col]
+            self.set_piece(from_row, to_col, None)
+        
+        # Handle castling
+        castling_info = None
+        if move & MOVE_CASTLE:
+            if to_col > from_col:  # Kingside
+                rook = self.board[from_row][7]
+                castling_info = (from_row, 7, from_row, 5, rook, rook.has_moved)
+                self.set_piece(from_row, 7, None)
+                self.set_piece(from_row, 5, rook)
+                rook.has_moved = True
+            else:  # Queenside
+                rook = self.board[from_row][0]
+                castling_info = (from_row, 0, from_row, 3, rook, rook.has_moved)
+                self.set_piece(from_row, 0, None)
+                self.set_piece(from_row, 3, rook)
+                rook.has_moved = True
+        
+        # Update en passant target
+        if move & MOVE_DOUBLE_PUSH:
+            self.en_passant_target = ((from_row + to_row) // 2, from_col)
+        else:
+            self.en_passant_target = None
+        
+        # Make the move
+        self.set_piece(to_row, to_col, piece)
+        self.set_piece(from_row, from_col, None)
+        piece.has_moved = True
+        
+        self.undo_stack[self.ply] = (
+            piece, captured, from_row, from_col, to_row, to_col, old_en_passant,
+            old_has_moved, en_passant_captured, en_passant_pos, castling_info
+        )
+        self.ply += 1
+    
+    def undo_temp_move(self):
+        """Undo the most recent temporary move."""
+        self.ply -= 1
+        (piece, captured, from_row, from_col, to_row, to_col, old_en_passant,
+         old_has_moved, en_passant_captured, en_passant_pos,
+         castling_info) = self.undo_stack[self.ply]
+        
+        # Restore piece position
+        self.set_piece(to_row, to_col, captured)
+        self.set_piece(from_row, from_col, piece)
+        piece.has_moved = old_has_moved
+        self.en_passant_target = old_en_passant
+        
+        # Restore en passant captured piece
+        if en_passant_captured is not None:
+            self.set_piece(en_passant_pos[0], en_passant_pos[1], en_passant_captured)
+        
+        # Restore castling
+        if castling_info is not None:
+            r_from_row, r_from_col, r_to_row, r_to_col, rook, old_moved = castling_info
+            self.set_piece(r_to_row, r_to_col, None)
+            self.set_piece(r_from_row, r_from_col, rook)
+            rook.has_moved = old_moved
+    
+    def has_legal_moves(self, color, check_info=None):
+        """Check if the given color has any legal moves.
+        
+        check_info may be passed in if the caller already has it from get_check_info.
+        """
+        if check_info is None:
+            check_info = self.get_check_info(color)
+        base = 6 * COLOR_INDEX[color]
+        
+        # Walk the per-type bitboards rather than scanning all 64 squares
+        for piece_type in PIECE_TYPES:
+            for sq in iter_squares(self.bb[base + piece_type - 1]):
+                row, col = sq >> 3, sq & 7
+                if self.generate_legal_moves(row, col, self.board[row][col], check_info):
+                    return True
         return False
     
     def reset(self):
         """Reset the board to initial state."""
         self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.bb = [0] * 12
+        self.occ_w = 0
+        self.occ_b = 0
+        self.occ = 0
+        self.score = 0
+        self.piece_key = 0
         self.en_passant_target = None
         self.setup_board()
@@ -10,42 +10,57 @@ import math
 from constants import (
     VALID_MOVE_COLOR, CAPTURE_MOVE_COLOR,
     SELECTED_COLOR, LAST_MOVE_COLOR,
-    WHITE, BLACK
+    WHITE, BLACK, KING
 )
-from board import Board
-from ai import ChessAI, PIECE_VALUES, PIECE_TABLES
+from board import Board, bb_index, iter_squares
+from piece import Piece
+from ai import ChessAI
 
 # Themed board colors - dark slate
 BOARD_LIGHT = (140, 135, 145)   # Slate gray
 BOARD_DARK = (55, 50, 65)       # Deep charcoal purple
 
+# Length of the checkmate king-fall animation, in seconds
+KING_FALL_DURATION = 0.8
 
-def evaluate_position(board):
-    """Evaluate the board position. Positive = good for white."""
-    score = 0
-    
-    for row in range(8):
-        for col in range(8):
-            piece = board.get_piece(row, col)
-            if piece is not None:
-                # Base piece value
-                value = PIECE_VALUES[piece.piece_type]
-                
-                # Position bonus
-                table = PIECE_TABLES.get(piece.piece_type)
-                if table:
-                    if piece.color == WHITE:
-                        value += table[row][col]
-                    else:
-                        value += table[7 - row][col]
-                
-                # Add for white, subtract for black
-                if piece.color == WHITE:
-                    score += value
-                else:
-                    score -= value
-    
-    return score
+# Algebraic square names, indexed row * 8 + col
+SQUARE_NAMES = [f"{chr(ord('a') + col)}{8 - row}" for row in range(8) for col in range(8)]
+
+# Side of the square noise tile repeated over the background, in pixels
+NOISE_TILE_SIZE = 256
+
+# Event types neither the game nor the menu reacts to. Every event forces a
+# full redraw in ChessGame.run, and mouse motion alone arrives dozens of times
+# a frame, so these are kept off the queue entirely.
+IGNORED_EVENTS = [
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+    pygame.KEYUP, pygame.TEXTINPUT, pygame.ACTIVEEVENT,
+    pygame.WINDOWENTER, pygame.WINDOWLEAVE,
+    pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST,
+]
+
+# Rendered text surfaces kept by ChessGame.render_text before the cache is reset
+TEXT_CACHE_SIZE = 256
+
+# How long an idle frame sleeps waiting for input, in ms; bounds the latency
+# of polled work such as the AI move delay and online opponent moves
+IDLE_WAIT_MS = 50
+
+# Idle wait while the window is minimized or hidden and nothing is drawn
+HIDDEN_WAIT_MS = 200
+
+# The check highlight pulses at 6 rad/s through this many precomputed alphas
+CHECK_PULSE_STEPS = 16
+CHECK_PULSE_ALPHAS = [int(60 + 60 * (math.sin(i * 2 * math.pi / CHECK_PULSE_STEPS) + 1) / 2)
+                      for i in range(CHECK_PULSE_STEPS)]
+
+
+def format_eval(centipawns):
+    """Format an evaluation in pawns with a sign, e.g. "+0.4" or "-12"."""
+    pawns = centipawns / 100.0
+    if abs(pawns) >= 10:
+        return f"+{int(pawns)}" if pawns > 0 else f"{int(pawns)}"
+    return f"+{pawns:.1f}" if pawns > 0 else f"{pawns:.1f}"
 
 
 class ChessGame:
@@ -61,9 +76,13 @@ class ChessGame:
         
         self.clock = pygame.time.Clock()
         self.running = True
+        pygame.event.set_blocked(IGNORED_EVENTS)
+        self.high_quality_pieces = False  # Use smoothscale when rescaling pieces
         
         self.load_piece_images()
         self.load_sounds()
+        self.render_noise_tile()
+        self.dimensions = None  # Screen size the layout and cached surfaces are for
         self.update_dimensions()
         self.reset_game()
         
@@ -78,6 +97,10 @@ class ChessGame:
         # Animation
         self.time = 0
         
+        # Snapshot of the state behind the last full redraw (see get_view_state)
+        self.last_view_state = None
+        self.window_visible = True  # False while minimized or hidden
+        
         # Online mode state
         self.opponent_disconnected = False
         self.pending_opponent_move = None
@@ -100,14 +123,19 @@ class ChessGame:
     
     def flip_coords(self, row, col):
         """Flip board coordinates if viewing from black's perspective."""
-        if self.board_flipped:
-            return (7 - row, 7 - col)
-        return (row, col)
+        flip_index = self.flip_index
+        return (flip_index[row], flip_index[col])
     
     def update_dimensions(self):
-        """Update dimensions based on current screen size."""
-        self.width = self.screen.get_width()
-        self.height = self.screen.get_height()
+        """Update dimensions based on current screen size.
+        
+        Everything derived from the size is rebuilt here, so nothing is done
+        if the size has not actually changed.
+        """
+        if self.screen.get_size() == self.dimensions:
+            return
+        self.dimensions = self.screen.get_size()
+        self.width, self.height = self.dimensions
         
         # Calculate board size to fit screen
         # Leave room for side panel and bottom labels
@@ -123,6 +151,7 @@ class ChessGame:
         # Position the board (centered vertically with room for labels)
         self.board_x = 30
         self.board_y = (self.height - self.board_size) // 2 - 10
+        self.update_orientation()
         
         # Side panel
         self.panel_x = self.board_x + self.board_size + 20
@@ -138,33 +167,181 @@ class ChessGame:
         self.font = pygame.font.SysFont('sfns', max(20, base_size // 32))
         self.small_font = pygame.font.SysFont('sfns', max(15, base_size // 45))
         self.title_font = pygame.font.SysFont('sfns', max(28, base_size // 22), bold=True)
+        
+        # Text rendered with the old fonts is stale
+        self.text_cache = {}
+        self.history_surfaces = []
+        
+        self.render_background()
+        self.render_static_board()
+        self.render_highlights()
+        self.render_panel_background()
+    
+    def update_orientation(self):
+        """Build the square position tables for the current size and board flip.
+        
+        square_xy maps a logical (unflipped) square, indexed row * 8 + col,
+        straight to its on-screen position, so drawing never has to flip.
+        """
+        # Row/column lookup used by flip_coords
+        self.flip_index = list(range(7, -1, -1)) if self.board_flipped else list(range(8))
+        
+        square_x = [self.board_x + self.flip_index[col] * self.square_size for col in range(8)]
+        square_y = [self.board_y + self.flip_index[row] * self.square_size for row in range(8)]
+        self.square_xy = [(x, y) for y in square_y for x in square_x]
+    
+    def render_static_board(self):
+        """Pre-render the parts of the board that only change on resize or flip.
+        
+        The shadow, squares, edge glow, border and coordinate labels go into
+        one surface, so draw_board only blits it and adds the highlights.
+        """
+        shadow_offset = 8
+        label_height = self.small_font.get_height()
+        
+        # Surface origin on screen, leaving room for the rank labels on the left
+        self.static_board_pos = (self.board_x - 18, self.board_y - 2)
+        surface = pygame.Surface(
+            (self.board_size + 18 + shadow_offset,
+             self.board_size + 2 + max(shadow_offset, 5 + label_height)),
+            pygame.SRCALPHA
+        )
+        board_x = self.board_x - self.static_board_pos[0]
+        board_y = self.board_y - self.static_board_pos[1]
+        
+        # Board shadow
+        shadow_rect = pygame.Rect(
+            board_x + shadow_offset,
+            board_y + shadow_offset,
+            self.board_size, self.board_size
+        )
+        pygame.draw.rect(surface, (10, 8, 15), shadow_rect, border_radius=4)
+        
+        # Draw squares with themed colors
+        for row in range(8):
+            for col in range(8):
+                x = board_x + col * self.square_size
+                y = board_y + row * self.square_size
+                
+                is_light = (row + col) % 2 == 0
+                color = BOARD_LIGHT if is_light else BOARD_DARK
+                rect = pygame.Rect(x, y, self.square_size, self.square_size)
+                pygame.draw.rect(surface, color, rect)
+        
+        # Subtle inner glow on board edges
+        board_rect = pygame.Rect(board_x, board_y, self.board_size, self.board_size)
+        pygame.draw.rect(surface, (120, 110, 130), board_rect, 2)
+        
+        # Board border
+        border_rect = pygame.Rect(board_x - 2, board_y - 2,
+                                  self.board_size + 4, self.board_size + 4)
+        pygame.draw.rect(surface, (80, 65, 50), border_rect, 3, border_radius=4)
+        
+        # Coordinate labels
+        label_color = (100, 100, 110)
+        for i in range(8):
+            # Rank numbers (1-8) - flip for black
+            rank_num = (i + 1) if self.board_flipped else (8 - i)
+            rank_label = self.small_font.render(str(rank_num), True, label_color)
+            surface.blit(rank_label,
+                         (board_x - 18, board_y + i * self.square_size + self.square_size // 3))
+            
+            # File letters (a-h) - flip for black
+            file_idx = (7 - i) if self.board_flipped else i
+            file_label = self.small_font.render(chr(ord('a') + file_idx), True, label_color)
+            surface.blit(file_label,
+                         (board_x + i * self.square_size + self.square_size // 2 - 4,
+                          board_y + self.board_size + 5))
+        
+        self.static_board_surface = surface
+    
+    def render_highlights(self):
+        """Pre-render the square highlight overlays for the current square size."""
+        size = self.square_size
+        center = (size // 2, size // 2)
+        
+        self.last_move_highlight = pygame.Surface((size, size), pygame.SRCALPHA)
+        self.last_move_highlight.fill((180, 160, 80, 70))  # Golden highlight
+        
+        self.selected_highlight = pygame.Surface((size, size), pygame.SRCALPHA)
+        self.selected_highlight.fill(SELECTED_COLOR)
+        
+        # Capture indicator - ring around edge
+        self.capture_highlight = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(self.capture_highlight, CAPTURE_MOVE_COLOR, center, size // 2 - 4, 5)
+        
+        # Move indicator - dot in center
+        self.move_highlight = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(self.move_highlight, VALID_MOVE_COLOR, center, size // 6)
+        
+        # Check glow, one surface per step of the pulse
+        self.check_highlights = []
+        for alpha in CHECK_PULSE_ALPHAS:
+            check_highlight = pygame.Surface((size, size))
+            check_highlight.fill((255, 80, 80))
+            check_highlight.set_alpha(alpha)
+            self.check_highlights.append(check_highlight)
+    
+    def render_panel_background(self):
+        """Pre-render the side panel's translucent background, border and controls."""
+        self.panel_surface = pygame.Surface((self.panel_width, self.panel_height), pygame.SRCALPHA)
+        self.panel_surface.fill((30, 28, 40, 200))
+        pygame.draw.rect(self.panel_surface, (60, 55, 70), self.panel_surface.get_rect(), 1, border_radius=12)
+        
+        # Controls at bottom, below a divider - different for online mode
+        padding = 20
+        controls_y = self.panel_height - 60
+        pygame.draw.line(self.panel_surface, (50, 48, 60),
+                        (padding, controls_y - 10), (self.panel_width - padding, controls_y - 10), 1)
+        if self.game_mode == 'online':
+            controls = ["Y: Rematch", "ESC: Menu", "F11: Fullscreen"]
+        else:
+            controls = ["R: Restart", "ESC: Menu", "F11: Fullscreen"]
+        for i, ctrl in enumerate(controls):
+            ctrl_surface = self.small_font.render(ctrl, True, (100, 95, 110))
+            self.panel_surface.blit(ctrl_surface, (padding, controls_y + i * 18))
     
     def load_piece_images(self):
-        """Load piece images from assets folder."""
-        self.original_images = {}
-        self.scaled_images = {}
-        base_path = os.path.join(os.path.dirname(__file__), 'assets', 'images', 'imgs-80px')
+        """Load piece images from assets folder.
         
-        piece_names = ['pawn', 'knight', 'bishop', 'rook', 'queen', 'king']
-        colors = ['white', 'black']
+        Images are stored in lists indexed like the board's bitboards
+        (see bb_index), with None for any image that failed to load.
+        """
+        self.original_images = [None] * 12
+        self.scaled_images = [None] * 12
+        base_path = os.path.join(os.path.dirname(__file__), 'assets', 'images', 'imgs-80px')
         
-        for color in colors:
-            for piece in piece_names:
+        for color in (WHITE, BLACK):
+            for piece_type, piece in Piece.PIECE_NAMES.items():
                 filename = f"{color}_{piece}.png"
                 filepath = os.path.join(base_path, filename)
                 try:
                     image = pygame.image.load(filepath).convert_alpha()
-                    self.original_images[f"{color}_{piece}"] = image
+                    self.original_images[bb_index(piece_type, color)] = image
                 except pygame.error as e:
                     print(f"Could not load image {filepath}: {e}")
     
     def scale_images(self):
         """Scale images to current square size."""
         target_size = int(self.square_size * 0.85)
-        for key, image in self.original_images.items():
-            self.scaled_images[key] = pygame.transform.smoothscale(
-                image, (target_size, target_size)
-            )
+        scale = pygame.transform.smoothscale if self.high_quality_pieces else pygame.transform.scale
+        for index, image in enumerate(self.original_images):
+            if image is not None:
+                # Convert to the display format so blits don't convert per frame
+                self.scaled_images[index] = scale(image, (target_size, target_size)).convert_alpha()
+        self.king_fall_frames = {}
+    
+    def get_king_fall_frames(self, image_index):
+        """Get the checkmate animation frames for a king, rotated in 3 degree steps.
+        
+        Built on first use after each rescale, so the animation itself never rotates.
+        """
+        frames = self.king_fall_frames.get(image_index)
+        if frames is None:
+            image = self.scaled_images[image_index]
+            frames = [pygame.transform.rotate(image, -angle) for angle in range(0, 91, 3)]
+            self.king_fall_frames[image_index] = frames
+        return frames
     
     def load_sounds(self):
         """Load sound effects."""
@@ -186,8 +363,10 @@ class ChessGame:
         self.winner = None
         self.in_check = False
         self.move_history = []
+        self.history_surfaces = []  # Rendered move history lines, filled in by draw_side_panel
         self.evaluation_history = []  # Track evaluation after each move
         self.current_eval = 0  # Current position evaluation
+        self.update_eval_display()
         self.selected_square = None
         self.valid_moves = []
         self.last_move = None
@@ -273,11 +452,11 @@ class ChessGame:
         self.move_history.append(self.last_move)
         
         # Calculate and store evaluation
-        self.current_eval = evaluate_position(self.board)
+        self.current_eval = self.board.static_eval
         self.evaluation_history.append(self.current_eval)
+        self.update_eval_display()
         
         self.current_turn = BLACK if self.current_turn == WHITE else WHITE
-        self.in_check = self.board.is_in_check(self.current_turn)
         self.check_game_over()
         
         self.selected_square = None
@@ -337,6 +516,8 @@ class ChessGame:
             self.rematch_pending = False
             self.reset_game()
             # Update the board flip based on new color
+            self.update_orientation()
+            self.render_static_board()
             self.rematch_requested = False
             self.opponent_wants_rematch = False
             return
@@ -364,19 +545,33 @@ class ChessGame:
             self.move_history.append(self.last_move)
             
             # Calculate and store evaluation
-            self.current_eval = evaluate_position(self.board)
+            self.current_eval = self.board.static_eval
             self.evaluation_history.append(self.current_eval)
+            self.update_eval_display()
             
             self.current_turn = BLACK if self.current_turn == WHITE else WHITE
-            self.in_check = self.board.is_in_check(self.current_turn)
             self.check_game_over()
             
             self.selected_square = None
             self.valid_moves = []
     
+    def update_eval_display(self):
+        """Precompute the evaluation text, color and bar split after the eval changes."""
+        self.eval_text = format_eval(self.current_eval)
+        self.eval_color = (120, 200, 120) if self.current_eval >= 0 else (200, 120, 120)
+        
+        # White's portion of the bar (0.5 = equal), clamped between 0 and 1
+        clamped_eval = max(-1000, min(1000, self.current_eval))
+        self.eval_white_portion = 0.5 + (clamped_eval / 2000.0)
+    
     def check_game_over(self):
-        """Check if the game is over."""
-        if not self.board.has_legal_moves(self.current_turn):
+        """Update whether the side to move is in check, and check if the game is over.
+        
+        The checkers found for the check test are reused by the legal move search.
+        """
+        check_info = self.board.get_check_info(self.current_turn)
+        self.in_check = check_info[1] != 0
+        if not self.board.has_legal_moves(self.current_turn, check_info):
             self.game_over = True
             if self.in_check:
                 self.winner = BLACK if self.current_turn == WHITE else WHITE
@@ -391,167 +586,133 @@ class ChessGame:
     
     def draw_board(self):
         """Draw the chess board with modern themed styling."""
-        # Board shadow
-        shadow_offset = 8
-        shadow_rect = pygame.Rect(
-            self.board_x + shadow_offset,
-            self.board_y + shadow_offset,
-            self.board_size, self.board_size
-        )
-        pygame.draw.rect(self.screen, (10, 8, 15), shadow_rect, border_radius=4)
-        
-        # Draw squares with themed colors
-        for row in range(8):
-            for col in range(8):
-                x = self.board_x + col * self.square_size
-                y = self.board_y + row * self.square_size
-                
-                is_light = (row + col) % 2 == 0
-                color = BOARD_LIGHT if is_light else BOARD_DARK
-                rect = pygame.Rect(x, y, self.square_size, self.square_size)
-                pygame.draw.rect(self.screen, color, rect)
-        
-        # Subtle inner glow on board edges
-        board_rect = pygame.Rect(self.board_x, self.board_y, self.board_size, self.board_size)
-        pygame.draw.rect(self.screen, (120, 110, 130), board_rect, 2)
+        # Shadow, squares, border and labels are pre-rendered
+        self.screen.blit(self.static_board_surface, self.static_board_pos)
         
         # Highlight last move with elegant gold tint
         if self.last_move:
             for pos in [(self.last_move[0], self.last_move[1]), 
                        (self.last_move[2], self.last_move[3])]:
-                row, col = self.flip_coords(pos[0], pos[1])
-                highlight = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
-                highlight.fill((180, 160, 80, 70))  # Golden highlight
-                self.screen.blit(highlight, 
-                               (self.board_x + col * self.square_size,
-                                self.board_y + row * self.square_size))
+                self.screen.blit(self.last_move_highlight, self.square_xy[pos[0] * 8 + pos[1]])
         
         # Highlight king in check with pulsing glow
         if self.in_check and not self.game_over:
             king_pos = self.board.find_king(self.current_turn)
             if king_pos:
-                check_surface = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
                 # Pulsing effect
-                pulse = (math.sin(self.time * 6) + 1) / 2
-                alpha = int(60 + 60 * pulse)
-                check_surface.fill((255, 80, 80, alpha))
-                draw_row, draw_col = self.flip_coords(king_pos[0], king_pos[1])
-                self.screen.blit(check_surface,
-                               (self.board_x + draw_col * self.square_size,
-                                self.board_y + draw_row * self.square_size))
+                step = int(self.time * 6 * CHECK_PULSE_STEPS / (2 * math.pi)) % CHECK_PULSE_STEPS
+                self.screen.blit(self.check_highlights[step], self.square_xy[king_pos[0] * 8 + king_pos[1]])
         
         # Highlight selected square
         if self.selected_square:
-            row, col = self.flip_coords(self.selected_square[0], self.selected_square[1])
-            highlight = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
-            highlight.fill(SELECTED_COLOR)
-            self.screen.blit(highlight,
-                           (self.board_x + col * self.square_size,
-                            self.board_y + row * self.square_size))
+            row, col = self.selected_square
+            self.screen.blit(self.selected_highlight, self.square_xy[row * 8 + col])
         
         # Highlight valid moves
         for move in self.valid_moves:
             logical_row, logical_col = move
-            draw_row, draw_col = self.flip_coords(logical_row, logical_col)
-            x = self.board_x + draw_col * self.square_size
-            y = self.board_y + draw_row * self.square_size
-            move_surface = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
+            square_pos = self.square_xy[logical_row * 8 + logical_col]
             
             if self.board.get_piece(logical_row, logical_col) is not None or move == self.board.en_passant_target:
-                # Capture indicator - ring around edge
-                pygame.draw.circle(move_surface, CAPTURE_MOVE_COLOR,
-                                 (self.square_size // 2, self.square_size // 2),
-                                 self.square_size // 2 - 4, 5)
+                self.screen.blit(self.capture_highlight, square_pos)
             else:
-                # Move indicator - dot in center
-                pygame.draw.circle(move_surface, VALID_MOVE_COLOR,
-                                 (self.square_size // 2, self.square_size // 2),
-                                 self.square_size // 6)
-            
-            self.screen.blit(move_surface, (x, y))
-        
-        # Board border
-        border_rect = pygame.Rect(self.board_x - 2, self.board_y - 2,
-                                  self.board_size + 4, self.board_size + 4)
-        pygame.draw.rect(self.screen, (80, 65, 50), border_rect, 3, border_radius=4)
-        
-        # Coordinate labels
-        label_color = (100, 100, 110)
-        for i in range(8):
-            # Rank numbers (1-8) - flip for black
-            rank_num = (i + 1) if self.board_flipped else (8 - i)
-            rank_label = self.small_font.render(str(rank_num), True, label_color)
-            self.screen.blit(rank_label,
-                           (self.board_x - 18, self.board_y + i * self.square_size + self.square_size // 3))
-            
-            # File letters (a-h) - flip for black
-            file_idx = (7 - i) if self.board_flipped else i
-            file_label = self.small_font.render(chr(ord('a') + file_idx), True, label_color)
-            self.screen.blit(file_label,
-                           (self.board_x + i * self.square_size + self.square_size // 2 - 4,
-                            self.board_y + self.board_size + 5))
+                self.screen.blit(self.move_highlight, square_pos)
     
     def draw_pieces(self):
-        """Draw all pieces on the board with checkmate animation."""
-        for row in range(8):
-            for col in range(8):
-                piece = self.board.get_piece(row, col)
-                if piece is not None:
-                    image_key = f"{piece.color}_{piece.get_name()}"
-                    if image_key in self.scaled_images:
-                        image = self.scaled_images[image_key]
-                        # Flip coordinates for black's perspective
-                        draw_row, draw_col = self.flip_coords(row, col)
-                        base_x = self.board_x + draw_col * self.square_size + (self.square_size - image.get_width()) // 2
-                        base_y = self.board_y + draw_row * self.square_size + (self.square_size - image.get_height()) // 2
+        """Draw all pieces on the board with checkmate animation.
+        
+        Walks the board's piece bitboards, so only occupied squares are visited.
+        """
+        bb = self.board.bb
+        for image_index, image in enumerate(self.scaled_images):
+            if image is None:
+                continue
+            for sq in iter_squares(bb[image_index]):
+                row, col = sq >> 3, sq & 7
+                square_x, square_y = self.square_xy[sq]
+                base_x = square_x + (self.square_size - image.get_width()) // 2
+                base_y = square_y + (self.square_size - image.get_height()) // 2
+                
+                # Check if this is the fallen king
+                if (self.fallen_king_pos and 
+                    self.fallen_king_pos == (row, col) and 
+                    image_index % 6 == KING - 1):
+                    # Animate king falling over
+                    elapsed = self.time - self.checkmate_time
+                    fall_duration = KING_FALL_DURATION
+                    frames = self.get_king_fall_frames(image_index)
+                    
+                    if elapsed < fall_duration:
+                        # Rotation and fall animation
+                        progress = min(1.0, elapsed / fall_duration)
+                        # Ease out
+                        progress = 1 - (1 - progress) ** 3
+                        
+                        # Rotate up to 90 degrees
+                        rotated = frames[min(30, int(progress * 30))]
                         
-                        # Check if this is the fallen king
-                        if (self.fallen_king_pos and 
-                            self.fallen_king_pos == (row, col) and 
-                            piece.get_name() == 'king'):
-                            # Animate king falling over
-                            elapsed = self.time - self.checkmate_time
-                            fall_duration = 0.8
-                            
-                            if elapsed < fall_duration:
-                                # Rotation and fall animation
-                                progress = min(1.0, elapsed / fall_duration)
-                                # Ease out
-                                progress = 1 - (1 - progress) ** 3
-                                
-                                angle = progress * 90  # Rotate 90 degrees
-                                
-                                # Rotate the image
-                                rotated = pygame.transform.rotate(image, -angle)
-                                
-                                # Offset to simulate falling
-                                fall_offset_x = int(progress * self.square_size * 0.3)
-                                fall_offset_y = int(progress * self.square_size * 0.1)
-                                
-                                # Center the rotated image
-                                rot_rect = rotated.get_rect()
-                                draw_x = base_x + fall_offset_x - (rot_rect.width - image.get_width()) // 2
-                                draw_y = base_y + fall_offset_y - (rot_rect.height - image.get_height()) // 2
-                                
-                                self.screen.blit(rotated, (draw_x, draw_y))
-                            else:
-                                # Final fallen position
-                                rotated = pygame.transform.rotate(image, -90)
-                                rot_rect = rotated.get_rect()
-                                draw_x = base_x + int(self.square_size * 0.3) - (rot_rect.width - image.get_width()) // 2
-                                draw_y = base_y + int(self.square_size * 0.1) - (rot_rect.height - image.get_height()) // 2
-                                self.screen.blit(rotated, (draw_x, draw_y))
-                        else:
-                            self.screen.blit(image, (base_x, base_y))
+                        # Offset to simulate falling
+                        fall_offset_x = int(progress * self.square_size * 0.3)
+                        fall_offset_y = int(progress * self.square_size * 0.1)
+                        
+                        # Center the rotated image
+                        rot_rect = rotated.get_rect()
+                        draw_x = base_x + fall_offset_x - (rot_rect.width - image.get_width()) // 2
+                        draw_y = base_y + fall_offset_y - (rot_rect.height - image.get_height()) // 2
+                        
+                        self.screen.blit(rotated, (draw_x, draw_y))
+                    else:
+                        # Final fallen position
+                        rotated = frames[-1]
+                        rot_rect = rotated.get_rect()
+                        draw_x = base_x + int(self.square_size * 0.3) - (rot_rect.width - image.get_width()) // 2
+                        draw_y = base_y + int(self.square_size * 0.1) - (rot_rect.height - image.get_height()) // 2
+                        self.screen.blit(rotated, (draw_x, draw_y))
+                else:
+                    self.screen.blit(image, (base_x, base_y))
+    
+    def render_text(self, font, text, color):
+        """Render antialiased text, reusing the surface if it was rendered before."""
+        key = (font, text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            if len(self.text_cache) >= TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            surface = font.render(text, True, color)
+            self.text_cache[key] = surface
+        return surface
+    
+    def render_history_entry(self, index):
+        """Render the move and evaluation text of one move history line."""
+        move = self.move_history[index]
+        from_sq = SQUARE_NAMES[move[0] * 8 + move[1]]
+        to_sq = SQUARE_NAMES[move[2] * 8 + move[3]]
+        move_text = f"{index + 1}. {from_sq}-{to_sq}"
+        
+        is_white_move = index % 2 == 0
+        color = (220, 220, 225) if is_white_move else (140, 140, 150)
+        move_surface = self.small_font.render(move_text, True, color)
+        
+        # Get evaluation for this move
+        eval_surface = None
+        if index < len(self.evaluation_history):
+            move_eval = self.evaluation_history[index]
+            eval_color = (100, 180, 100) if move_eval >= 0 else (180, 100, 100)
+            eval_surface = self.small_font.render(format_eval(move_eval), True, eval_color)
+        
+        return move_surface, eval_surface
     
     def draw_side_panel(self):
-        """Draw the modern information side panel."""
+        """Draw the modern information side panel.
+        
+        Text goes through render_text and the move history through
+        history_surfaces, so each string is rasterized only once. Text is
+        collected in text_blits and blitted in one batch at the end.
+        """
         # Panel background - subtle glass effect
-        panel_rect = pygame.Rect(self.panel_x, self.panel_y, self.panel_width, self.panel_height)
-        panel_surf = pygame.Surface((self.panel_width, self.panel_height), pygame.SRCALPHA)
-        panel_surf.fill((30, 28, 40, 200))
-        self.screen.blit(panel_surf, (self.panel_x, self.panel_y))
-        pygame.draw.rect(self.screen, (60, 55, 70), panel_rect, 1, border_radius=12)
+        self.screen.blit(self.panel_surface, (self.panel_x, self.panel_y))
+        
+        text_blits = []
         
         padding = 20
         content_x = self.panel_x + padding
@@ -562,27 +723,27 @@ class ChessGame:
             opponent = self.opponent_name or 'Opponent'
             mode_text = f"Online vs {opponent}"
             color_text = f"(You are {self.player_color.capitalize()})"
-            mode_surface = self.small_font.render(mode_text, True, (120, 115, 130))
-            self.screen.blit(mode_surface, (content_x, y_offset))
+            mode_surface = self.render_text(self.small_font, mode_text, (120, 115, 130))
+            text_blits.append((mode_surface, (content_x, y_offset)))
             y_offset += 20
-            color_surface = self.small_font.render(color_text, True, (100, 180, 100))
-            self.screen.blit(color_surface, (content_x, y_offset))
+            color_surface = self.render_text(self.small_font, color_text, (100, 180, 100))
+            text_blits.append((color_surface, (content_x, y_offset)))
             y_offset += 25
         elif self.game_mode == 'ai':
             mode_text = f"vs AI ({self.difficulty.capitalize()})" if self.difficulty else "vs AI"
-            mode_surface = self.small_font.render(mode_text, True, (120, 115, 130))
-            self.screen.blit(mode_surface, (content_x, y_offset))
+            mode_surface = self.render_text(self.small_font, mode_text, (120, 115, 130))
+            text_blits.append((mode_surface, (content_x, y_offset)))
             y_offset += 35
         else:
             mode_text = "vs Human"
-            mode_surface = self.small_font.render(mode_text, True, (120, 115, 130))
-            self.screen.blit(mode_surface, (content_x, y_offset))
+            mode_surface = self.render_text(self.small_font, mode_text, (120, 115, 130))
+            text_blits.append((mode_surface, (content_x, y_offset)))
             y_offset += 35
         
         # Current turn or game result
         if self.game_over:
-            result_surface = self.font.render(self.game_result, True, (100, 200, 120))
-            self.screen.blit(result_surface, (content_x, y_offset))
+            result_surface = self.render_text(self.font, self.game_result, (100, 200, 120))
+            text_blits.append((result_surface, (content_x, y_offset)))
             
             # Show rematch UI for online mode
             if self.game_mode == 'online' and not self.opponent_disconnected:
@@ -597,29 +758,29 @@ class ChessGame:
                     rematch_text = "Opponent wants rematch!"
                     rematch_color = (100, 180, 255)
                     y_offset2 = y_offset + 25
-                    accept_text = self.small_font.render("Press Y to accept", True, (100, 180, 255))
-                    self.screen.blit(accept_text, (content_x, y_offset2))
+                    accept_text = self.render_text(self.small_font, "Press Y to accept", (100, 180, 255))
+                    text_blits.append((accept_text, (content_x, y_offset2)))
                 else:
                     rematch_text = "Press Y for rematch"
                     rematch_color = (150, 150, 160)
                 
-                rematch_surface = self.font.render(rematch_text, True, rematch_color)
-                self.screen.blit(rematch_surface, (content_x, y_offset))
+                rematch_surface = self.render_text(self.font, rematch_text, rematch_color)
+                text_blits.append((rematch_surface, (content_x, y_offset)))
         else:
             turn_text = f"{self.current_turn.capitalize()}'s Turn"
-            turn_surface = self.title_font.render(turn_text, True, (255, 255, 255))
-            self.screen.blit(turn_surface, (content_x, y_offset))
+            turn_surface = self.render_text(self.title_font, turn_text, (255, 255, 255))
+            text_blits.append((turn_surface, (content_x, y_offset)))
             
             if self.in_check:
                 y_offset += 35
-                check_surface = self.font.render("CHECK!", True, (255, 100, 100))
-                self.screen.blit(check_surface, (content_x, y_offset))
+                check_surface = self.render_text(self.font, "CHECK!", (255, 100, 100))
+                text_blits.append((check_surface, (content_x, y_offset)))
             
             if self.ai_thinking:
                 y_offset += 35
                 dots = "." * (int(self.time * 3) % 4)
-                thinking_surface = self.font.render(f"AI thinking{dots}", True, (160, 155, 170))
-                self.screen.blit(thinking_surface, (content_x, y_offset))
+                thinking_surface = self.render_text(self.font, f"AI thinking{dots}", (160, 155, 170))
+                text_blits.append((thinking_surface, (content_x, y_offset)))
         
         y_offset += 50
         
@@ -629,18 +790,12 @@ class ChessGame:
         y_offset += 15
         
         # Evaluation bar
-        eval_label = self.small_font.render("Evaluation", True, (140, 135, 150))
-        self.screen.blit(eval_label, (content_x, y_offset))
+        eval_label = self.render_text(self.small_font, "Evaluation", (140, 135, 150))
+        text_blits.append((eval_label, (content_x, y_offset)))
         
-        # Format eval score (convert centipawns to pawns)
-        eval_pawns = self.current_eval / 100.0
-        if abs(eval_pawns) >= 10:
-            eval_text = f"+{int(eval_pawns)}" if eval_pawns > 0 else f"{int(eval_pawns)}"
-        else:
-            eval_text = f"+{eval_pawns:.1f}" if eval_pawns > 0 else f"{eval_pawns:.1f}"
-        eval_color = (120, 200, 120) if eval_pawns >= 0 else (200, 120, 120)
-        eval_score_surface = self.small_font.render(eval_text, True, eval_color)
-        self.screen.blit(eval_score_surface, (content_x + 80, y_offset))
+        # Eval score, formatted in update_eval_display
+        eval_score_surface = self.render_text(self.small_font, self.eval_text, self.eval_color)
+        text_blits.append((eval_score_surface, (content_x + 80, y_offset)))
         y_offset += 22
         
         # Evaluation bar visual
@@ -651,11 +806,7 @@ class ChessGame:
         # Background (black side)
         pygame.draw.rect(self.screen, (40, 40, 45), (bar_x, y_offset, bar_width, bar_height), border_radius=3)
         
-        # Calculate white's portion (0.5 = equal, clamped between 0 and 1)
-        # Use sigmoid-like scaling for large advantages
-        clamped_eval = max(-1000, min(1000, self.current_eval))
-        white_portion = 0.5 + (clamped_eval / 2000.0)
-        white_width = int(bar_width * white_portion)
+        white_width = int(bar_width * self.eval_white_portion)
         
         # White bar
         if white_width > 0:
@@ -668,89 +819,123 @@ class ChessGame:
         y_offset += 25
         
         # Move history header
-        history_label = self.small_font.render("Move History", True, (140, 135, 150))
-        self.screen.blit(history_label, (content_x, y_offset))
+        history_label = self.render_text(self.small_font, "Move History", (140, 135, 150))
+        text_blits.append((history_label, (content_x, y_offset)))
         y_offset += 25
         
         # Move history with evaluations
         max_moves = (self.panel_height - y_offset - 100) // 22
         start_idx = max(0, len(self.move_history) - max_moves)
         
-        for i, move in enumerate(self.move_history[start_idx:]):
-            actual_idx = start_idx + i
-            move_num = actual_idx + 1
-            from_sq = f"{chr(ord('a') + move[1])}{8 - move[0]}"
-            to_sq = f"{chr(ord('a') + move[3])}{8 - move[2]}"
-            
-            # Get evaluation for this move
-            if actual_idx < len(self.evaluation_history):
-                move_eval = self.evaluation_history[actual_idx] / 100.0
-                if abs(move_eval) >= 10:
-                    eval_str = f"+{int(move_eval)}" if move_eval > 0 else f"{int(move_eval)}"
-                else:
-                    eval_str = f"+{move_eval:.1f}" if move_eval > 0 else f"{move_eval:.1f}"
-            else:
-                eval_str = ""
-            
-            move_text = f"{move_num}. {from_sq}-{to_sq}"
-            
-            is_white_move = actual_idx % 2 == 0
-            color = (220, 220, 225) if is_white_move else (140, 140, 150)
-            move_surface = self.small_font.render(move_text, True, color)
-            self.screen.blit(move_surface, (content_x, y_offset))
+        # Render lines for any moves made since the last frame
+        history_surfaces = self.history_surfaces
+        while len(history_surfaces) < len(self.move_history):
+            history_surfaces.append(self.render_history_entry(len(history_surfaces)))
+        
+        for move_surface, eval_surface in history_surfaces[start_idx:]:
+            text_blits.append((move_surface, (content_x, y_offset)))
             
             # Draw evaluation next to move
-            if eval_str:
-                eval_color = (100, 180, 100) if move_eval >= 0 else (180, 100, 100)
-                eval_surface = self.small_font.render(eval_str, True, eval_color)
-                self.screen.blit(eval_surface, (content_x + 95, y_offset))
+            if eval_surface is not None:
+                text_blits.append((eval_surface, (content_x + 95, y_offset)))
             
             y_offset += 22
         
-        # Controls at bottom - different for online mode
-        controls_y = self.panel_y + self.panel_height - 60
-        pygame.draw.line(self.screen, (50, 48, 60),
-                        (content_x, controls_y - 10),
-                        (self.panel_x + self.panel_width - padding, controls_y - 10), 1)
+        self.screen.blits(text_blits, doreturn=False)
+    
+    def render_background(self):
+        """Pre-render the gradient background and its noise for the current size."""
+        color_top = (15, 12, 30)
+        color_mid = (20, 18, 42)
+        color_bottom = (12, 20, 32)
         
-        if self.game_mode == 'online':
-            controls = ["Y: Rematch", "ESC: Menu", "F11: Fullscreen"]
-        else:
-            controls = ["R: Restart", "ESC: Menu", "F11: Fullscreen"]
-        for i, ctrl in enumerate(controls):
-            ctrl_surface = self.small_font.render(ctrl, True, (100, 95, 110))
-            self.screen.blit(ctrl_surface, (content_x, controls_y + i * 18))
+        self.background_surface = pygame.Surface((self.width, self.height)).convert()
+        
+        # Two-stage gradient, top to mid then mid to bottom. The stages are
+        # separate loops in exact integer math: row y sits 2 * y / height of
+        # the way through the first stage and (2 * y - height) / height
+        # through the second.
+        height = self.height
+        half = (height + 1) // 2  # First row of the second stage
+        (r0, g0, b0), (r1, g1, b1), (r2, g2, b2) = color_top, color_mid, color_bottom
+        row_colors = []
+        for y in range(half):
+            step = 2 * y
+            row_colors.append((r0 + (r1 - r0) * step // height,
+                               g0 + (g1 - g0) * step // height,
+                               b0 + (b1 - b0) * step // height))
+        for y in range(half, height):
+            step = 2 * y - height
+            row_colors.append((r1 + (r2 - r1) * step // height,
+                               g1 + (g2 - g1) * step // height,
+                               b1 + (b2 - b1) * step // height))
+        
+        # The color only steps a few dozen times top to bottom, so fill each
+        # run of identical rows with one rect instead of a line per row
+        run_start = 0
+        for y in range(1, self.height + 1):
+            if y == self.height or row_colors[y] != row_colors[run_start]:
+                self.background_surface.fill(row_colors[run_start],
+                                             (0, run_start, self.width, y - run_start))
+                run_start = y
+        
+        # Subtle noise, tiled so resizing does not regenerate it
+        for x in range(0, self.width, NOISE_TILE_SIZE):
+            for y in range(0, self.height, NOISE_TILE_SIZE):
+                self.background_surface.blit(self.noise_tile, (x, y))
+    
+    def render_noise_tile(self):
+        """Pre-render the tile of background noise used by render_background."""
+        rng = random.Random(42)  # Same noise every time, without touching the global state
+        
+        # Written straight into an RGBA buffer rather than through a set_at
+        # call per pixel
+        size = NOISE_TILE_SIZE
+        count = int(size * size * 0.015)
+        noise_pixels = [bytes((255, 255, 255, alpha)) for alpha in range(3, 11)]
+        noise = bytearray(size * size * 4)
+        for x, y, pixel in zip(rng.choices(range(size), k=count),
+                               rng.choices(range(size), k=count),
+                               rng.choices(noise_pixels, k=count)):
+            i = (y * size + x) * 4
+            noise[i:i + 4] = pixel
+        self.noise_tile = pygame.image.frombuffer(noise, (size, size), 'RGBA').convert_alpha()
     
     def draw_gradient_background(self):
         """Draw gradient background matching menu style."""
-        random.seed(42)
+        self.screen.blit(self.background_surface, (0, 0))
+    
+    def get_view_state(self):
+        """Get a snapshot of the game state that the drawn frame depends on.
+        
+        A full redraw is only needed when this changes; animations are
+        handled separately by get_animated_rects.
+        """
+        return (self.width, self.height, self.board_flipped, len(self.move_history),
+                self.last_move, self.selected_square, self.current_turn, self.in_check,
+                self.game_over, self.game_result, self.ai_thinking, self.opponent_name,
+                self.rematch_requested, self.opponent_wants_rematch)
+    
+    def get_animated_rects(self):
+        """Get the screen areas that change from frame to frame on their own."""
+        rects = []
         
-        color_top = (15, 12, 30)
-        color_mid = (20, 18, 42)
-        color_bottom = (12, 20, 32)
+        # Pulsing check highlight
+        if self.in_check and not self.game_over:
+            king_pos = self.board.find_king(self.current_turn)
+            if king_pos:
+                rects.append(pygame.Rect(self.square_xy[king_pos[0] * 8 + king_pos[1]],
+                                         (self.square_size, self.square_size)))
         
-        for y in range(self.height):
-            t = y / self.height
-            if t < 0.5:
-                t2 = t * 2
-                r = int(color_top[0] + (color_mid[0] - color_top[0]) * t2)
-                g = int(color_top[1] + (color_mid[1] - color_top[1]) * t2)
-                b = int(color_top[2] + (color_mid[2] - color_top[2]) * t2)
-            else:
-                t2 = (t - 0.5) * 2
-                r = int(color_mid[0] + (color_bottom[0] - color_mid[0]) * t2)
-                g = int(color_mid[1] + (color_bottom[1] - color_mid[1]) * t2)
-                b = int(color_mid[2] + (color_bottom[2] - color_mid[2]) * t2)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (self.width, y))
-        
-        # Subtle noise
-        noise_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        for _ in range(int(self.width * self.height * 0.015)):
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            alpha = random.randint(3, 10)
-            noise_surf.set_at((x, y), (255, 255, 255, alpha))
-        self.screen.blit(noise_surf, (0, 0))
+        # "AI thinking..." dots
+        if self.ai_thinking:
+            rects.append(pygame.Rect(self.panel_x, self.panel_y, self.panel_width, self.panel_height))
+        
+        # Falling king, plus a little slack to draw its final position
+        if self.fallen_king_pos and self.time - self.checkmate_time < KING_FALL_DURATION + 0.1:
+            rects.append(pygame.Rect(self.board_x, self.board_y, self.board_size, self.board_size))
+        
+        return rects
     
     def draw(self):
         """Draw the complete game screen."""
@@ -766,16 +951,33 @@ class ChessGame:
     
     def run(self):
         """Main game loop. Returns True to go back to menu, False/None to quit."""
+        self.last_view_state = None  # The screen may have been recreated
+        idle = False
         while self.running:
+            resized = False
+            if idle:
+                # Nothing on screen is moving, so sleep until input arrives
+                event = pygame.event.wait(IDLE_WAIT_MS if self.window_visible else HIDDEN_WAIT_MS)
+                events = [event] + pygame.event.get() if event.type != pygame.NOEVENT else []
+            else:
+                events = pygame.event.get()
             self.time = pygame.time.get_ticks() / 1000.0
             
-            for event in pygame.event.get():
+            for event in events:
+                # Any event may change what is on screen (or expose the window)
+                self.last_view_state = None
+                
                 if event.type == pygame.QUIT:
                     return None
                 
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.get_surface()
-                    self.update_dimensions()
+                    resized = True
+                
+                elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                    self.window_visible = False
+                
+                elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWMAXIMIZED):
+                    self.window_visible = True
                 
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:
@@ -794,13 +996,43 @@ class ChessGame:
                     elif event.key == pygame.K_F11:
                         return 'toggle_fullscreen'
             
+            # A window drag queues many resizes; only the final size matters
+            if resized:
+                self.screen = pygame.display.get_surface()
+                self.update_dimensions()
+            
             if self.game_mode == 'ai':
                 self.update_ai()
             elif self.game_mode == 'online':
                 self.update_online()
             
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(60)
+            # Repaint the whole window only when the game state changed;
+            # otherwise push just the animated areas, if any
+            view_state = self.get_view_state()
+            idle = False
+            if not self.window_visible:
+                # Nothing can be seen; the event that shows the window again
+                # forces a full redraw
+                idle = True
+            elif view_state != self.last_view_state:
+                self.draw()
+                pygame.display.flip()
+                self.last_view_state = view_state
+            else:
+                dirty_rects = self.get_animated_rects()
+                if dirty_rects:
+                    # Clip to the animated areas so the rest of the frame
+                    # costs no pixel work
+                    self.screen.set_clip(dirty_rects[0].unionall(dirty_rects[1:]))
+                    self.draw()
+                    self.screen.set_clip(None)
+                    pygame.display.update(dirty_rects)
+                else:
+                    idle = True
+            
+            # Cap the frame rate while drawing; idle frames are paced by the
+            # event wait instead
+            if not idle:
+                self.clock.tick(60)
         
         return None
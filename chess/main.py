@@ -3,14 +3,24 @@ Chess Game in Pygame
 Entry point with menu system and fullscreen support.
 """
 
+import threading
 import pygame
 from menu import Menu
 from game import ChessGame
 
 
+def set_display_mode(fullscreen, window_width, window_height):
+    """Switch between fullscreen and the resizable window; returns the new screen."""
+    if fullscreen:
+        return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    return pygame.display.set_mode((window_width, window_height), pygame.RESIZABLE)
+
+
 def main():
-    pygame.init()
-    pygame.mixer.init()
+    # Only what the window needs comes up first; the mixer is started once
+    # the window is showing, as probing audio devices can be slow
+    pygame.display.init()
+    pygame.font.init()
     
     # Get display info for fullscreen
     display_info = pygame.display.Info()
@@ -21,10 +31,7 @@ def main():
     window_width = min(1200, screen_width - 100)
     window_height = min(800, screen_height - 100)
     
-    screen = pygame.display.set_mode(
-        (window_width, window_height),
-        pygame.RESIZABLE
-    )
+    screen = set_display_mode(False, window_width, window_height)
     pygame.display.set_caption("Chess")
     
     # Set icon if available
@@ -32,11 +39,20 @@ def main():
         import os
         icon_path = os.path.join(os.path.dirname(__file__), 'assets', 'images', 'imgs-80px', 'white_knight.png')
         if os.path.exists(icon_path):
-            icon = pygame.image.load(icon_path)
+            icon = pygame.image.load(icon_path).convert_alpha()
             pygame.display.set_icon(icon)
     except:
         pass
     
+    # Paint the window while the rest starts up
+    screen.fill((20, 18, 35))
+    pygame.display.flip()
+    pygame.mixer.init()
+    
+    # Fonts for the online status screens; SysFont lookups are slow
+    font = pygame.font.SysFont('sfns', 24)
+    title_font = pygame.font.SysFont('sfns', 32, bold=True)
+    
     running = True
     is_fullscreen = False
     
@@ -51,13 +67,7 @@ def main():
         
         if result == 'toggle_fullscreen':
             is_fullscreen = not is_fullscreen
-            if is_fullscreen:
-                screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-            else:
-                screen = pygame.display.set_mode(
-                    (window_width, window_height),
-                    pygame.RESIZABLE
-                )
+            screen = set_display_mode(is_fullscreen, window_width, window_height)
             continue
         
         game_mode, difficulty = result
@@ -67,7 +77,6 @@ def main():
             from network import NetworkClient, WEBSOCKETS_AVAILABLE
             
             if not WEBSOCKETS_AVAILABLE:
-                font = pygame.font.SysFont('sfns', 24)
                 screen.fill((20, 18, 35))
                 error_text = font.render("Error: 'websockets' module not installed", True, (255, 100, 100))
                 help_text = font.render("Run: pip install websockets", True, (200, 200, 210))
@@ -97,19 +106,25 @@ def main():
             connection_error = None
             waiting_for_match = False
             
+            # Set from the network thread whenever one of the callbacks fires
+            state_changed = threading.Event()
+            
             def on_waiting():
                 nonlocal waiting_for_match
                 waiting_for_match = True
+                state_changed.set()
             
             def on_match_found(color, opponent):
                 nonlocal match_found, player_color, opponent_name
                 match_found = True
                 player_color = color
                 opponent_name = opponent
+                state_changed.set()
             
             def on_error(error):
                 nonlocal connection_error
                 connection_error = error
+                state_changed.set()
             
             network.on_waiting = on_waiting
             network.on_match_found = on_match_found
@@ -118,15 +133,20 @@ def main():
             # Start connection
             network.start()
             
-            font = pygame.font.SysFont('sfns', 24)
-            title_font = pygame.font.SysFont('sfns', 32, bold=True)
+            # Text that never changes while waiting
+            title = title_font.render("Online Multiplayer", True, (255, 255, 255))
+            cancel = font.render("Press ESC to cancel", True, (120, 120, 130))
+            back_text = font.render("Press ESC to go back...", True, (150, 150, 160))
+            status_surfaces = {}
             
             # Wait for match or cancel
             waiting = True
             start_time = pygame.time.get_ticks()
+            shown = None  # What the screen currently shows; redraw when it changes
             
             while waiting and running:
                 for event in pygame.event.get():
+                    shown = None  # Any event may have exposed the window
                     if event.type == pygame.QUIT:
                         running = False
                         waiting = False
@@ -141,35 +161,40 @@ def main():
                 
                 # Check for connection error
                 if connection_error:
-                    screen.fill((20, 18, 35))
-                    error_text = font.render(f"Connection error: {connection_error}", True, (255, 100, 100))
-                    back_text = font.render("Press ESC to go back...", True, (150, 150, 160))
-                    screen.blit(error_text, (50, 200))
-                    screen.blit(back_text, (50, 260))
-                    pygame.display.flip()
-                    continue
-                
-                # Draw waiting screen
-                screen.fill((20, 18, 35))
-                
-                elapsed = (pygame.time.get_ticks() - start_time) / 1000
-                dots = "." * (int(elapsed * 2) % 4)
-                
-                if waiting_for_match:
-                    status_text = f"Waiting for opponent{dots}"
+                    if shown != connection_error:
+                        screen.fill((20, 18, 35))
+                        error_text = font.render(f"Connection error: {connection_error}", True, (255, 100, 100))
+                        screen.blit(error_text, (50, 200))
+                        screen.blit(back_text, (50, 260))
+                        pygame.display.flip()
+                        shown = connection_error
                 else:
-                    status_text = f"Connecting to server{dots}"
+                    elapsed = (pygame.time.get_ticks() - start_time) / 1000
+                    dots = "." * (int(elapsed * 2) % 4)
+                    
+                    if waiting_for_match:
+                        status_text = f"Waiting for opponent{dots}"
+                    else:
+                        status_text = f"Connecting to server{dots}"
+                    
+                    # Draw waiting screen
+                    if shown != status_text:
+                        status = status_surfaces.get(status_text)
+                        if status is None:
+                            status = font.render(status_text, True, (200, 200, 210))
+                            status_surfaces[status_text] = status
+                        
+                        screen.fill((20, 18, 35))
+                        screen.blit(title, (50, 150))
+                        screen.blit(status, (50, 220))
+                        screen.blit(cancel, (50, 280))
+                        pygame.display.flip()
+                        shown = status_text
                 
-                title = title_font.render("Online Multiplayer", True, (255, 255, 255))
-                status = font.render(status_text, True, (200, 200, 210))
-                cancel = font.render("Press ESC to cancel", True, (120, 120, 130))
-                
-                screen.blit(title, (50, 150))
-                screen.blit(status, (50, 220))
-                screen.blit(cancel, (50, 280))
-                
-                pygame.display.flip()
-                pygame.time.wait(50)
+                # Sleep until the network thread reports something, but wake
+                # often enough to handle input and advance the dots
+                state_changed.wait(0.05)
+                state_changed.clear()
             
             if not match_found:
                 network.stop()
@@ -187,13 +212,7 @@ def main():
                 break
             elif game_result == 'toggle_fullscreen':
                 is_fullscreen = not is_fullscreen
-                if is_fullscreen:
-                    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                else:
-                    screen = pygame.display.set_mode(
-                        (window_width, window_height),
-                        pygame.RESIZABLE
-                    )
+                screen = set_display_mode(is_fullscreen, window_width, window_height)
             continue
         
         # Start game with selected mode and difficulty
@@ -205,13 +224,7 @@ def main():
             break
         elif game_result == 'toggle_fullscreen':
             is_fullscreen = not is_fullscreen
-            if is_fullscreen:
-                screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-            else:
-                screen = pygame.display.set_mode(
-                    (window_width, window_height),
-                    pygame.RESIZABLE
-                )
+            screen = set_display_mode(is_fullscreen, window_width, window_height)
         # Otherwise go back to menu
     
     pygame.quit()
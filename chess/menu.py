@@ -8,6 +8,33 @@ import os
 
 from constants import WHITE, BLACK
 
+# Rendered text surfaces kept by Menu.render_text before the cache is reset
+TEXT_CACHE_SIZE = 256
+
+# Button text colors a hover fade steps through, from normal to hovered. A
+# fixed palette keeps every faded label a render_text cache hit.
+HOVER_STEPS = 16
+HOVER_COLORS = [
+    tuple(int(normal + (hover - normal) * i / (HOVER_STEPS - 1))
+          for normal, hover in zip((140, 135, 150), (255, 255, 255)))
+    for i in range(HOVER_STEPS)
+]
+
+# Starting position drawn on the menu board as (row, col, piece image key)
+PIECE_LAYOUT = (
+    (0, 0, 'black_rook'), (0, 1, 'black_knight'), (0, 2, 'black_bishop'),
+    (0, 3, 'black_queen'), (0, 4, 'black_king'), (0, 5, 'black_bishop'),
+    (0, 6, 'black_knight'), (0, 7, 'black_rook'),
+    (1, 0, 'black_pawn'), (1, 1, 'black_pawn'), (1, 2, 'black_pawn'),
+    (1, 3, 'black_pawn'), (1, 4, 'black_pawn'), (1, 5, 'black_pawn'),
+    (1, 6, 'black_pawn'), (1, 7, 'black_pawn'),
+    (6, 0, 'white_pawn'), (6, 1, 'white_pawn'), (6, 2, 'white_pawn'),
+    (6, 3, 'white_pawn'), (6, 4, 'white_pawn'), (6, 5, 'white_pawn'),
+    (6, 6, 'white_pawn'), (6, 7, 'white_pawn'),
+    (7, 0, 'white_rook'), (7, 1, 'white_knight'), (7, 2, 'white_bishop'),
+    (7, 3, 'white_queen'), (7, 4, 'white_king'), (7, 5, 'white_bishop'),
+    (7, 6, 'white_knight'), (7, 7, 'white_rook'),
+)
 
 class Menu:
     """Clean minimalist menu design."""
@@ -15,16 +42,35 @@ class Menu:
     def __init__(self, screen):
         self.screen = screen
         self.clock = pygame.time.Clock()
+        self.font_sizes = None  # Fonts and cached text are built for these sizes
         self.update_dimensions()
         
+        # Pre-rendered background and the size it was rendered for
+        self.background_surface = None
+        self.background_size = None
+        
+        # Dimming overlay behind the exit confirmation, likewise
+        self.overlay_surface = None
+        self.overlay_size = None
+        
         self.hovered_button = None
         self.menu_state = 'mode'
         self.time = 0
         self.hover_animations = {}
+        self.fading_rects = []  # Rects of buttons with a hover fade running
+        
+        # Button name -> rect for each screen, filled in as they are drawn
+        self.mode_buttons = {}
+        self.difficulty_buttons = {}
+        self.exit_buttons = {}
         
         # Load chess piece images
         self.piece_images = {}
         self.load_pieces()
+        
+        # Pre-rendered decorative board and the square size it was rendered for
+        self.board_surface = None
+        self.board_square_size = None
     
     def load_pieces(self):
         """Load chess piece images for decoration."""
@@ -46,57 +92,110 @@ class Menu:
         self.height = self.screen.get_height()
         self.scale = min(self.width / 1200, self.height / 800, 1.3)
         
+        # SysFont lookups are slow, so only rebuild the fonts when their
+        # point sizes actually change, not on every pixel of a resize
+        font_sizes = (int(58 * self.scale), int(22 * self.scale), int(15 * self.scale))
+        if font_sizes == self.font_sizes:
+            return
+        self.font_sizes = font_sizes
+        
         # Clean modern fonts - SF Pro for high quality
-        self.font_title = pygame.font.SysFont('sfnsdisplay', int(58 * self.scale), bold=True)
-        self.font_button = pygame.font.SysFont('sfns', int(22 * self.scale))
-        self.font_small = pygame.font.SysFont('sfns', int(15 * self.scale))
+        self.font_title = pygame.font.SysFont('sfnsdisplay', font_sizes[0], bold=True)
+        self.font_button = pygame.font.SysFont('sfns', font_sizes[1])
+        self.font_small = pygame.font.SysFont('sfns', font_sizes[2])
+        
+        # Text rendered with the old fonts is stale
+        self.text_cache = {}
+    
+    def render_text(self, font, text, color):
+        """Render antialiased text, reusing the surface if it was rendered before."""
+        key = (font, text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            if len(self.text_cache) >= TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            surface = font.render(text, True, color)
+            self.text_cache[key] = surface
+        return surface
     
     def draw_background(self):
-        """Draw premium gradient background with subtle texture."""
+        """Draw premium gradient background, rendering it only when the size changes."""
+        if self.background_size != (self.width, self.height):
+            self.render_background()
+            self.background_size = (self.width, self.height)
+        self.screen.blit(self.background_surface, (0, 0))
+    
+    def render_background(self):
+        """Pre-render the gradient background with subtle texture."""
         import random
-        random.seed(42)  # Consistent noise pattern
+        rng = random.Random(42)  # Consistent noise pattern
         
         # Rich gradient colors
         color_top = (15, 12, 30)       # Deep dark purple
         color_mid = (20, 18, 42)       # Rich purple
         color_bottom = (12, 20, 32)    # Dark blue
         
-        # Create gradient surface
-        for y in range(self.height):
-            t = y / self.height
-            
-            # Two-stage gradient for more depth
-            if t < 0.5:
-                t2 = t * 2
-                r = int(color_top[0] + (color_mid[0] - color_top[0]) * t2)
-                g = int(color_top[1] + (color_mid[1] - color_top[1]) * t2)
-                b = int(color_top[2] + (color_mid[2] - color_top[2]) * t2)
-            else:
-                t2 = (t - 0.5) * 2
-                r = int(color_mid[0] + (color_bottom[0] - color_mid[0]) * t2)
-                g = int(color_mid[1] + (color_bottom[1] - color_mid[1]) * t2)
-                b = int(color_mid[2] + (color_bottom[2] - color_mid[2]) * t2)
-            
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (self.width, y))
-        
-        # Add subtle noise texture for premium feel
-        noise_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        for _ in range(int(self.width * self.height * 0.02)):
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            alpha = random.randint(3, 12)
-            noise_surf.set_at((x, y), (255, 255, 255, alpha))
-        self.screen.blit(noise_surf, (0, 0))
+        # Two-stage gradient for more depth, in exact integer math: row y
+        # sits 2 * y / height of the way through the first stage and
+        # (2 * y - height) / height through the second
+        height = self.height
+        half = (height + 1) // 2  # First row of the second stage
+        (r0, g0, b0), (r1, g1, b1), (r2, g2, b2) = color_top, color_mid, color_bottom
+        self.background_surface = pygame.Surface((self.width, self.height)).convert()
+        row_colors = []
+        for y in range(half):
+            step = 2 * y
+            row_colors.append((r0 + (r1 - r0) * step // height,
+                               g0 + (g1 - g0) * step // height,
+                               b0 + (b1 - b0) * step // height))
+        for y in range(half, height):
+            step = 2 * y - height
+            row_colors.append((r1 + (r2 - r1) * step // height,
+                               g1 + (g2 - g1) * step // height,
+                               b1 + (b2 - b1) * step // height))
+        
+        # The color only steps a few dozen times top to bottom, so fill each
+        # run of identical rows with one rect instead of a line per row
+        run_start = 0
+        for y in range(1, height + 1):
+            if y == height or row_colors[y] != row_colors[run_start]:
+                self.background_surface.fill(row_colors[run_start],
+                                             (0, run_start, self.width, y - run_start))
+                run_start = y
+        
+        # Add subtle noise texture for premium feel, written straight into an
+        # RGBA buffer rather than through a set_at call per pixel
+        count = int(self.width * self.height * 0.02)
+        noise_pixels = [bytes((255, 255, 255, alpha)) for alpha in range(3, 13)]
+        noise = bytearray(self.width * self.height * 4)
+        for x, y, pixel in zip(rng.choices(range(self.width), k=count),
+                               rng.choices(range(self.height), k=count),
+                               rng.choices(noise_pixels, k=count)):
+            i = (y * self.width + x) * 4
+            noise[i:i + 4] = pixel
+        noise_surf = pygame.image.frombuffer(noise, (self.width, self.height), 'RGBA')
+        self.background_surface.blit(noise_surf, (0, 0))
     
     def draw_chess_board(self):
-        """Draw clean chess board with pieces."""
+        """Draw clean chess board with pieces, rendering it only when the size changes."""
         board_size = int(280 * self.scale)
         square_size = board_size // 8
         actual_board_size = square_size * 8  # Actual size after integer division
         
-        # Position board on left side
+        if square_size != self.board_square_size:
+            self.render_chess_board(square_size)
+            self.board_square_size = square_size
+        
+        # Position board on left side; the border sits 2px outside the squares
         board_x = int(self.width * 0.28) - actual_board_size // 2
         board_y = self.height // 2 - actual_board_size // 2
+        self.screen.blit(self.board_surface, (board_x - 2, board_y - 2))
+    
+    def render_chess_board(self, square_size):
+        """Pre-render the decorative board with its border and pieces."""
+        actual_board_size = square_size * 8
+        self.board_surface = pygame.Surface((actual_board_size + 4, actual_board_size + 4)).convert()
+        board_x = board_y = 2  # Inside the border
         
         # Board colors - match game board
         light = (140, 135, 145)   # Slate gray
@@ -109,52 +208,41 @@ class Menu:
                 color = light if is_light else dark
                 x = board_x + col * square_size
                 y = board_y + row * square_size
-                pygame.draw.rect(self.screen, color, (x, y, square_size, square_size))
+                self.board_surface.fill(color, (x, y, square_size, square_size))
         
         # Simple border - use actual_board_size for correct alignment
-        pygame.draw.rect(self.screen, (120, 110, 130), 
-                        (board_x - 2, board_y - 2, actual_board_size + 4, actual_board_size + 4), 2)
+        pygame.draw.rect(self.board_surface, (120, 110, 130),
+                        (0, 0, actual_board_size + 4, actual_board_size + 4), 2)
         
         # Draw pieces
         if self.piece_images:
             piece_size = int(square_size * 0.85)
-            piece_layout = [
-                (0, 0, 'black_rook'), (0, 1, 'black_knight'), (0, 2, 'black_bishop'),
-                (0, 3, 'black_queen'), (0, 4, 'black_king'), (0, 5, 'black_bishop'),
-                (0, 6, 'black_knight'), (0, 7, 'black_rook'),
-                (1, 0, 'black_pawn'), (1, 1, 'black_pawn'), (1, 2, 'black_pawn'),
-                (1, 3, 'black_pawn'), (1, 4, 'black_pawn'), (1, 5, 'black_pawn'),
-                (1, 6, 'black_pawn'), (1, 7, 'black_pawn'),
-                (6, 0, 'white_pawn'), (6, 1, 'white_pawn'), (6, 2, 'white_pawn'),
-                (6, 3, 'white_pawn'), (6, 4, 'white_pawn'), (6, 5, 'white_pawn'),
-                (6, 6, 'white_pawn'), (6, 7, 'white_pawn'),
-                (7, 0, 'white_rook'), (7, 1, 'white_knight'), (7, 2, 'white_bishop'),
-                (7, 3, 'white_queen'), (7, 4, 'white_king'), (7, 5, 'white_bishop'),
-                (7, 6, 'white_knight'), (7, 7, 'white_rook'),
-            ]
+            scaled_pieces = {
+                key: pygame.transform.smoothscale(img, (piece_size, piece_size))
+                for key, img in self.piece_images.items()
+            }
             
-            for row, col, piece_key in piece_layout:
-                if piece_key in self.piece_images:
-                    img = self.piece_images[piece_key]
-                    scaled = pygame.transform.smoothscale(img, (piece_size, piece_size))
+            for row, col, piece_key in PIECE_LAYOUT:
+                if piece_key in scaled_pieces:
+                    scaled = scaled_pieces[piece_key]
                     x = board_x + col * square_size + (square_size - piece_size) // 2
                     y = board_y + row * square_size + (square_size - piece_size) // 2
-                    self.screen.blit(scaled, (x, y))
+                    self.board_surface.blit(scaled, (x, y))
     
     def draw_text_button(self, rect, text, is_hovered):
         """Draw simple text button."""
         btn_id = text
         target = 1.0 if is_hovered else 0.0
         current = self.hover_animations.get(btn_id, 0.0)
-        self.hover_animations[btn_id] = current + (target - current) * 0.2
-        progress = self.hover_animations[btn_id]
-        
-        # Colors
-        normal = (140, 135, 150)
-        hover = (255, 255, 255)
-        color = tuple(int(normal[i] + (hover[i] - normal[i]) * progress) for i in range(3))
-        
-        text_surf = self.font_button.render(text, True, color)
+        progress = current + (target - current) * 0.2
+        if abs(target - progress) < 0.01:
+            progress = target  # Settled, so the menu can stop redrawing
+        else:
+            self.fading_rects.append(rect)
+        self.hover_animations[btn_id] = progress
+        
+        color = HOVER_COLORS[round(progress * (HOVER_STEPS - 1))]
+        text_surf = self.render_text(self.font_button, text, color)
         text_rect = text_surf.get_rect(center=rect.center)
         self.screen.blit(text_surf, text_rect)
     
@@ -163,7 +251,7 @@ class Menu:
         title_x = int(self.width * 0.68)
         title_y = int(self.height * 0.25)
         
-        title = self.font_title.render("Chess", True, (255, 255, 255))
+        title = self.render_text(self.font_title, "Chess", (255, 255, 255))
         title_rect = title.get_rect(center=(title_x, title_y))
         self.screen.blit(title, title_rect)
     
@@ -216,16 +304,20 @@ class Menu:
         
         # Back button
         back_y = start_y + 3 * (button_height + spacing) + int(20 * self.scale)
-        self.back_button = pygame.Rect(menu_x - button_width // 2, back_y, button_width, button_height)
-        self.draw_text_button(self.back_button, "Back", self.hovered_button == 'back')
+        back_rect = pygame.Rect(menu_x - button_width // 2, back_y, button_width, button_height)
+        self.draw_text_button(back_rect, "Back", self.hovered_button == 'back')
+        self.difficulty_buttons['back'] = back_rect
     
     def draw_exit_confirmation(self):
         """Draw exit confirmation overlay."""
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
-        
-        msg = self.font_button.render("Exit to Desktop?", True, (255, 255, 255))
+        if self.overlay_size != (self.width, self.height):
+            # Uniform alpha, so a plain surface with surface alpha will do
+            self.overlay_surface = pygame.Surface((self.width, self.height)).convert()
+            self.overlay_surface.set_alpha(200)
+            self.overlay_size = (self.width, self.height)
+        self.screen.blit(self.overlay_surface, (0, 0))
+        
+        msg = self.render_text(self.font_button, "Exit to Desktop?", (255, 255, 255))
         msg_rect = msg.get_rect(center=(self.width // 2, self.height // 2 - 30))
         self.screen.blit(msg, msg_rect)
         
@@ -247,12 +339,13 @@ class Menu:
     
     def draw_footer(self):
         """Draw footer."""
-        footer = self.font_small.render("F11 Fullscreen  |  ESC Menu", True, (80, 80, 90))
+        footer = self.render_text(self.font_small, "F11 Fullscreen  |  ESC Menu", (80, 80, 90))
         footer_rect = footer.get_rect(center=(self.width // 2, self.height - 20))
         self.screen.blit(footer, footer_rect)
     
     def draw(self):
         """Render menu."""
+        self.fading_rects = []  # Filled by draw_text_button while fading
         self.draw_background()
         self.draw_chess_board()
         self.draw_title()
@@ -271,37 +364,28 @@ class Menu:
         """Main menu loop."""
         running = True
         self.menu_state = 'mode'
+        last_view_state = None  # State behind the last drawn frame
         
         while running:
             self.time = pygame.time.get_ticks() / 1000.0
             mouse_pos = pygame.mouse.get_pos()
             self.update_dimensions()
             
-            # Update hover
-            self.hovered_button = None
-            
+            # Update hover: one collidedict call tests every button of the
+            # current screen against the cursor
             if self.menu_state == 'exit_confirm':
-                if hasattr(self, 'exit_buttons'):
-                    for name, rect in self.exit_buttons.items():
-                        if rect.collidepoint(mouse_pos):
-                            self.hovered_button = name
-                            break
+                buttons = self.exit_buttons
             elif self.menu_state == 'mode':
-                if hasattr(self, 'mode_buttons'):
-                    for name, rect in self.mode_buttons.items():
-                        if rect.collidepoint(mouse_pos):
-                            self.hovered_button = name
-                            break
-            elif self.menu_state == 'difficulty':
-                if hasattr(self, 'back_button') and self.back_button.collidepoint(mouse_pos):
-                    self.hovered_button = 'back'
-                elif hasattr(self, 'difficulty_buttons'):
-                    for name, rect in self.difficulty_buttons.items():
-                        if rect.collidepoint(mouse_pos):
-                            self.hovered_button = name
-                            break
+                buttons = self.mode_buttons
+            else:
+                buttons = self.difficulty_buttons
+            hit = pygame.Rect(mouse_pos, (1, 1)).collidedict(buttons, True)
+            self.hovered_button = hit[0] if hit else None
             
             for event in pygame.event.get():
+                # Any event may change what is on screen (or expose the window)
+                last_view_state = None
+                
                 if event.type == pygame.QUIT:
                     return None
                 
@@ -340,8 +424,19 @@ class Menu:
                             else:
                                 return ('ai', self.hovered_button)
             
-            self.draw()
-            pygame.display.flip()
+            # Redraw only when something on screen can have changed; while
+            # just hover fades run, repaint and push only those buttons
+            view_state = (self.width, self.height, self.menu_state, self.hovered_button)
+            if view_state != last_view_state:
+                self.draw()
+                pygame.display.flip()
+                last_view_state = view_state
+            elif self.fading_rects:
+                dirty_rects = self.fading_rects
+                self.screen.set_clip(dirty_rects[0].unionall(dirty_rects[1:]))
+                self.draw()
+                self.screen.set_clip(None)
+                pygame.display.update(dirty_rects)
             self.clock.tick(60)
         
         return None
@@ -11,6 +11,25 @@ import queue
 # Server URL - Update this with your Railway deployment URL
 SERVER_URL = "wss://chess-production-dc4e.up.railway.app/ws"
 
+# Use orjson for message encoding when installed; it is several times faster
+# than the stdlib json module. json_dumps_bytes encodes straight to UTF-8 for
+# binary frames, which servers that announce support parse without a decode.
+try:
+    import orjson
+    
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+    
+    json_dumps_bytes = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    
+    def json_dumps_bytes(obj):
+        return json.dumps(obj).encode()
+    
+    json_loads = json.loads
+
 # Try to import websockets (will need to be installed)
 try:
     import websockets
@@ -30,9 +49,16 @@ class NetworkClient:
         self.player_color = None
         self.opponent_name = None
         
-        # Message queues for thread-safe communication
+        # Send binary frames once the server says it accepts them
+        self.binary_frames = False
+        
+        # Message queue for thread-safe communication
         self.incoming_queue = queue.Queue()
-        self.outgoing_queue = queue.Queue()
+        
+        # Outgoing messages, owned by the network thread's event loop; other
+        # threads hand messages over with _queue_message
+        self._loop = None
+        self._outgoing = None
         
         # Callbacks
         self.on_match_found = None
@@ -44,7 +70,6 @@ class NetworkClient:
         self.on_rematch_requested = None
         self.on_rematch_start = None
         
-        self._running = False
         self._thread = None
     
     def start(self):
@@ -54,14 +79,13 @@ class NetworkClient:
                 self.on_error("websockets module not installed")
             return False
         
-        self._running = True
         self._thread = threading.Thread(target=self._run_async_loop, daemon=True)
         self._thread.start()
         return True
     
     def stop(self):
         """Stop the network client."""
-        self._running = False
+        self._queue_message(None)  # Ends the send loop, which closes the connection
         if self._thread:
             self._thread.join(timeout=2)
     
@@ -69,55 +93,94 @@ class NetworkClient:
         """Run the async event loop in background thread."""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        self._outgoing = asyncio.Queue()
+        self._loop = loop
         try:
             loop.run_until_complete(self._connect_and_listen())
         except Exception as e:
             if self.on_error:
                 self.on_error(str(e))
         finally:
+            self._loop = None
             loop.close()
     
+    def _queue_message(self, msg):
+        """Queue a message for the send loop from any thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._outgoing.put_nowait, msg)
+        except RuntimeError:
+            pass  # The loop closed in the meantime
+    
     async def _connect_and_listen(self):
         """Connect to server and listen for messages."""
         try:
             async with websockets.connect(self.server_url) as ws:
                 self.ws = ws
                 self.connected = True
+                self.binary_frames = False
                 
                 # Send find_match request
-                await ws.send(json.dumps({
+                await ws.send(json_dumps({
                     'action': 'find_match',
-                    'name': 'Player'
+                    'name': 'Player',
+                    'batch': True  # This client unpacks batched array frames
                 }))
                 
-                while self._running:
-                    try:
-                        # Check for outgoing messages
-                        while not self.outgoing_queue.empty():
-                            msg = self.outgoing_queue.get_nowait()
-                            await ws.send(json.dumps(msg))
-                        
-                        # Wait for incoming message with timeout
-                        try:
-                            message = await asyncio.wait_for(ws.recv(), timeout=0.1)
-                            data = json.loads(message)
-                            self._handle_message(data)
-                        except asyncio.TimeoutError:
-                            pass
-                        
-                    except websockets.exceptions.ConnectionClosed:
-                        break
-                        
+                # Receive and send concurrently, each sleeping until it has
+                # work; the session ends when either stops
+                tasks = [asyncio.ensure_future(self._receive_loop(ws)),
+                         asyncio.ensure_future(self._send_loop(ws))]
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in pending:
+                    task.cancel()
+                for task in done:
+                    task.result()  # Re-raise errors for the handler below
+                
         except Exception as e:
             if self.on_error:
                 self.on_error(str(e))
         finally:
             self.connected = False
     
+    async def _receive_loop(self, ws):
+        """Handle incoming messages until the connection closes."""
+        try:
+            async for message in ws:
+                data = json_loads(message)
+                if isinstance(data, list):
+                    # The server batches messages queued together
+                    for item in data:
+                        self._handle_message(item)
+                else:
+                    self._handle_message(data)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+    
+    async def _send_loop(self, ws):
+        """Send queued messages until stop() queues None or the connection closes."""
+        outgoing = self._outgoing
+        try:
+            while True:
+                msg = await outgoing.get()
+                if msg is None:
+                    return
+                if self.binary_frames:
+                    await ws.send(json_dumps_bytes(msg))
+                else:
+                    await ws.send(json_dumps(msg))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+    
     def _handle_message(self, data):
         """Handle incoming server message."""
         msg_type = data.get('type')
         
+        if data.get('binary'):
+            self.binary_frames = True
+        
         if msg_type == 'waiting':
             if self.on_waiting:
                 self.on_waiting()
@@ -154,7 +217,7 @@ class NetworkClient:
     
     def send_move(self, from_row, from_col, to_row, to_col):
         """Send a move to the server."""
-        self.outgoing_queue.put({
+        self._queue_message({
             'action': 'move',
             'game_id': self.game_id,
             'move': [from_row, from_col, to_row, to_col]
@@ -162,7 +225,7 @@ class NetworkClient:
     
     def resign(self):
         """Resign from the current game."""
-        self.outgoing_queue.put({
+        self._queue_message({
             'action': 'resign',
             'game_id': self.game_id
         })
@@ -171,14 +234,15 @@ class NetworkClient:
         """Request a new match after game ends."""
         self.game_id = None
         self.player_color = None
-        self.outgoing_queue.put({
+        self._queue_message({
             'action': 'find_match',
-            'name': 'Player'
+            'name': 'Player',
+            'batch': True  # This client unpacks batched array frames
         })
     
     def request_rematch(self):
         """Request a rematch with the current opponent."""
-        self.outgoing_queue.put({
+        self._queue_message({
             'action': 'rematch_request',
             'game_id': self.game_id
         })
@@ -2,12 +2,14 @@
 Piece class representing a chess piece.
 """
 
-from constants import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from constants import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, BLACK
 
 
 class Piece:
     """Represents a chess piece."""
     
+    __slots__ = ('piece_type', 'color', 'has_moved', 'index')
+    
     PIECE_NAMES = {
         PAWN: 'pawn',
         KNIGHT: 'knight',
@@ -21,6 +23,9 @@ class Piece:
         self.piece_type = piece_type
         self.color = color
         self.has_moved = False
+        
+        # Index of this piece's bitboard on the board (see board.bb_index)
+        self.index = 6 * (color == BLACK) + piece_type - 1
     
     def __repr__(self):
         return f"{self.color}_{self.get_name()}"
@@ -4,204 +4,330 @@ Deploy on Railway, Render, or any Python hosting.
 """
 
 import asyncio
+import collections
+import itertools
 import json
+import logging
+import logging.handlers
 import os
+import queue
+from dataclasses import dataclass
 from aiohttp import web
 import aiohttp
 
-# Store active games and waiting players
-games = {}  # game_id -> {players: [], board_state: ..., current_turn: ...}
-waiting_player = None  # WebSocket of player waiting for match
-waiting_player_info = None
-player_games = {}  # ws -> {game_id, color} - track game info for each player
+# Use orjson for message encoding when installed; it is several times faster
+# than the stdlib json module
+try:
+    import orjson
+    
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+    
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+# uvloop is a faster drop-in event loop; it is optional and not on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+log = logging.getLogger(__name__)
+
+outboxes = {}  # ws -> queue of encoded messages waiting for its writer task
+closing_tasks = set()  # close() tasks for stalled clients, kept until done
+
+# Messages a peer may have queued before it counts as stalled and is dropped
+OUTBOX_SIZE = 64
+
+# Message types checked for every received frame
+WS_TEXT = aiohttp.WSMsgType.TEXT
+WS_BINARY = aiohttp.WSMsgType.BINARY
+WS_ERROR = aiohttp.WSMsgType.ERROR
+
+# Frames a client may send in any one second before it is disconnected
+MAX_MESSAGES_PER_SECOND = 20
+
+# Relayed moves are the bulk of the traffic, so only the move itself is
+# encoded per message and spliced into this fixed frame
+OPPONENT_MOVE_FRAME = '{"type":"opponent_move","move":%s}'
+
+# Notifications that never change, encoded once. 'binary' in waiting and
+# game_start tells clients they may send binary frames to this server.
+WAITING_FRAME = json_dumps({
+    'type': 'waiting',
+    'message': 'Waiting for opponent...',
+    'binary': True
+})
+OPPONENT_RESIGNED_FRAME = json_dumps({'type': 'opponent_resigned'})
+REMATCH_REQUESTED_FRAME = json_dumps({'type': 'rematch_requested'})
+OPPONENT_DISCONNECTED_FRAME = json_dumps({'type': 'opponent_disconnected'})
+
+
+def send_message(ws, data):
+    """Queue a message for ws without waiting on the socket to drain."""
+    send_encoded(ws, json_dumps(data))
+
+
+def send_encoded(ws, message):
+    """Queue an already encoded JSON message for ws."""
+    outbox = outboxes.get(ws)
+    if outbox is None:
+        return
+    try:
+        outbox.put_nowait(message)
+    except asyncio.QueueFull:
+        # Forget the outbox first so further messages are ignored and the
+        # client is closed only once
+        log.warning('Dropping stalled client')
+        del outboxes[ws]
+        task = asyncio.create_task(ws.close())
+        closing_tasks.add(task)
+        task.add_done_callback(closing_tasks.discard)
+
+
+async def write_messages(ws, outbox):
+    """Send queued messages to ws until the connection ends.
+    
+    For clients that announced 'batch' support in find_match, messages
+    queued in the same tick, such as rematch_requested followed by
+    rematch_start, go out together as one JSON array frame. Other clients
+    get one object per frame.
+    """
+    try:
+        while True:
+            message = await outbox.get()
+            if ws.get('batch') and not outbox.empty():
+                batch = [message]
+                while not outbox.empty():
+                    batch.append(outbox.get_nowait())
+                message = '[' + ','.join(batch) + ']'
+            await ws.send_str(message)
+    except ConnectionError:
+        pass
+
+
+@dataclass(slots=True)
+class Game:
+    """Two paired sockets and whether each has asked for a rematch."""
+    white: web.WebSocketResponse
+    black: web.WebSocketResponse
+    current_turn: str = 'white'
+    rematch_white: bool = False
+    rematch_black: bool = False
+
+
+class MatchMaker:
+    """Active games and the player waiting for a match.
+    
+    One instance lives on each app, so every server process pairs and tracks
+    its own players. Each socket keeps its own game_id, color and opponent in
+    its response state, so relaying a message is a single lookup on the
+    sender.
+    """
+    
+    __slots__ = ('games', 'game_ids', 'waiting_player', 'waiting_player_info')
+    
+    def __init__(self):
+        self.games = {}  # int game_id -> Game
+        self.game_ids = itertools.count()  # Never reused, unlike len(games)
+        self.waiting_player = None  # WebSocket of player waiting for match
+        self.waiting_player_info = None
+    
+    def start_game(self, white, black):
+        """Create a game between two sockets and return its id."""
+        game_id = next(self.game_ids)
+        self.games[game_id] = Game(white, black)
+        white.update(game_id=game_id, color='white', opponent=black)
+        black.update(game_id=game_id, color='black', opponent=white)
+        return game_id
+    
+    @staticmethod
+    def leave_game(ws):
+        """Forget the game a socket was playing in."""
+        ws.update(game_id=None, color=None, opponent=None)
+    
+    def find_match(self, ws, data):
+        """Player looking for a match.
+        
+        This never awaits, so reading and replacing the waiting player is
+        atomic with respect to other connections' handlers.
+        """
+        ws['batch'] = bool(data.get('batch'))
+        if (self.waiting_player is None or self.waiting_player.closed
+                or self.waiting_player is ws):
+            # No one waiting, this player waits
+            self.waiting_player = ws
+            self.waiting_player_info = data.get('name', 'Player')
+            send_encoded(ws, WAITING_FRAME)
+        else:
+            # Match found! Create game
+            game_id = self.start_game(self.waiting_player, ws)
+            
+            # Notify both players
+            send_message(self.waiting_player, {
+                'type': 'game_start',
+                'game_id': game_id,
+                'color': 'white',
+                'opponent': data.get('name', 'Player'),
+                'binary': True
+            })
+            send_message(ws, {
+                'type': 'game_start',
+                'game_id': game_id,
+                'color': 'black',
+                'opponent': self.waiting_player_info,
+                'binary': True
+            })
+            
+            # Clear waiting player
+            self.waiting_player = None
+            self.waiting_player_info = None
+    
+    def relay_move(self, ws, data):
+        """Player made a move - send it to the opponent."""
+        # No closed check: disconnect clears this pointer, and a move that
+        # slips in while the opponent is closing is dropped by its writer
+        opponent_ws = ws.get('opponent')
+        if opponent_ws:
+            send_encoded(opponent_ws,
+                         OPPONENT_MOVE_FRAME % json_dumps(data.get('move')))
+    
+    def resign(self, ws, data):
+        """Player resigned - end the game for both sides."""
+        if self.games.pop(ws.get('game_id'), None):
+            opponent_ws = ws['opponent']
+            self.leave_game(ws)
+            self.leave_game(opponent_ws)
+            if not opponent_ws.closed:
+                send_encoded(opponent_ws, OPPONENT_RESIGNED_FRAME)
+    
+    def request_rematch(self, ws, data):
+        """Player wants a rematch."""
+        game_id = ws.get('game_id')
+        game = self.games.get(game_id)
+        if game is None:
+            return
+        opponent_ws = ws['opponent']
+        
+        # Mark this player as wanting rematch
+        if ws is game.white:
+            game.rematch_white = True
+        else:
+            game.rematch_black = True
+        
+        # Notify opponent
+        if not opponent_ws.closed:
+            send_encoded(opponent_ws, REMATCH_REQUESTED_FRAME)
+        
+        # Check if both players want rematch
+        if game.rematch_white and game.rematch_black:
+            # Both want rematch - swap colors and start new game
+            new_white = game.black
+            new_black = game.white
+            new_game_id = self.start_game(new_white, new_black)
+            
+            # Notify both players
+            send_message(new_white, {
+                'type': 'rematch_start',
+                'game_id': new_game_id,
+                'color': 'white'
+            })
+            send_message(new_black, {
+                'type': 'rematch_start',
+                'game_id': new_game_id,
+                'color': 'black'
+            })
+            
+            # Clean up old game
+            self.games.pop(game_id, None)
+    
+    def disconnect(self, ws):
+        """Clean up after a socket closes and tell its opponent."""
+        if self.waiting_player == ws:
+            self.waiting_player = None
+            self.waiting_player_info = None
+        
+        if self.games.pop(ws.get('game_id'), None):
+            opponent_ws = ws['opponent']
+            # Clean up opponent's entry first, so it stops relaying to ws
+            self.leave_game(opponent_ws)
+            if not opponent_ws.closed:
+                send_encoded(opponent_ws, OPPONENT_DISCONNECTED_FRAME)
+
+
+# Client action -> MatchMaker method taking (ws, data)
+ACTION_HANDLERS = {
+    'find_match': MatchMaker.find_match,
+    'move': MatchMaker.relay_move,
+    'resign': MatchMaker.resign,
+    'rematch_request': MatchMaker.request_rematch,
+}
+
+MATCHMAKER = web.AppKey('matchmaker', MatchMaker)
 
 
 async def websocket_handler(request):
     """Handle WebSocket connections for multiplayer."""
-    global waiting_player, waiting_player_info
+    matchmaker = request.app[MATCHMAKER]
     
     ws = web.WebSocketResponse()
     await ws.prepare(request)
     
+    # Everything sent to this client goes through its own writer task, so a
+    # slow peer never holds up the handler that is sending to it
+    outboxes[ws] = asyncio.Queue(maxsize=OUTBOX_SIZE)
+    writer = asyncio.create_task(write_messages(ws, outboxes[ws]))
+    
+    # Arrival times of this client's latest frames, to cut off floods early
+    loop = asyncio.get_running_loop()
+    recent = collections.deque(maxlen=MAX_MESSAGES_PER_SECOND)
+    
     try:
         async for msg in ws:
-            if msg.type == aiohttp.WSMsgType.TEXT:
-                data = json.loads(msg.data)
-                action = data.get('action')
-                
-                if action == 'find_match':
-                    # Player looking for a match
-                    if waiting_player is None or waiting_player.closed:
-                        # No one waiting, this player waits
-                        waiting_player = ws
-                        waiting_player_info = data.get('name', 'Player')
-                        await ws.send_json({
-                            'type': 'waiting',
-                            'message': 'Waiting for opponent...'
-                        })
-                    else:
-                        # Match found! Create game
-                        game_id = f"game_{len(games)}"
-                        games[game_id] = {
-                            'players': {
-                                'white': waiting_player,
-                                'black': ws
-                            },
-                            'current_turn': 'white'
-                        }
-                        
-                        # Track game info for both players
-                        player_games[waiting_player] = {'game_id': game_id, 'color': 'white'}
-                        player_games[ws] = {'game_id': game_id, 'color': 'black'}
-                        
-                        # Notify both players
-                        await waiting_player.send_json({
-                            'type': 'game_start',
-                            'game_id': game_id,
-                            'color': 'white',
-                            'opponent': data.get('name', 'Player')
-                        })
-                        await ws.send_json({
-                            'type': 'game_start',
-                            'game_id': game_id,
-                            'color': 'black',
-                            'opponent': waiting_player_info
-                        })
-                        
-                        # Clear waiting player
-                        waiting_player = None
-                        waiting_player_info = None
-                
-                elif action == 'move':
-                    # Player made a move
-                    game_id = data.get('game_id')
-                    player_info = player_games.get(ws)
-                    if game_id in games and player_info:
-                        game = games[game_id]
-                        player_color = player_info['color']
-                        # Send move to opponent
-                        opponent_color = 'black' if player_color == 'white' else 'white'
-                        opponent_ws = game['players'].get(opponent_color)
-                        if opponent_ws and not opponent_ws.closed:
-                            await opponent_ws.send_json({
-                                'type': 'opponent_move',
-                                'move': data.get('move')
-                            })
-                
-                elif action == 'resign':
-                    game_id = data.get('game_id')
-                    player_info = player_games.get(ws)
-                    if game_id in games and player_info:
-                        game = games[game_id]
-                        player_color = player_info['color']
-                        opponent_color = 'black' if player_color == 'white' else 'white'
-                        opponent_ws = game['players'].get(opponent_color)
-                        if opponent_ws and not opponent_ws.closed:
-                            await opponent_ws.send_json({
-                                'type': 'opponent_resigned'
-                            })
-                        # Cleanup
-                        if opponent_ws in player_games:
-                            del player_games[opponent_ws]
-                        del games[game_id]
-                        del player_games[ws]
+            now = loop.time()
+            if len(recent) == MAX_MESSAGES_PER_SECOND and now - recent[0] < 1.0:
+                log.warning('Dropping client sending too many messages')
+                await ws.close()
+                break
+            recent.append(now)
+            
+            # Binary frames carry the raw UTF-8 JSON, which json_loads parses
+            # without aiohttp decoding it to a str first
+            msg_type = msg.type
+            if msg_type is WS_TEXT or msg_type is WS_BINARY:
+                data = json_loads(msg.data)
+                if not isinstance(data, dict):
+                    continue
+                handler = ACTION_HANDLERS.get(data.get('action'))
+                if handler:
+                    handler(matchmaker, ws, data)
                 
-                elif action == 'rematch_request':
-                    # Player wants a rematch
-                    game_id = data.get('game_id')
-                    player_info = player_games.get(ws)
-                    if player_info:
-                        game_id = player_info['game_id']
-                        if game_id in games:
-                            game = games[game_id]
-                            player_color = player_info['color']
-                            opponent_color = 'black' if player_color == 'white' else 'white'
-                            opponent_ws = game['players'].get(opponent_color)
-                            
-                            # Mark this player as wanting rematch
-                            game.setdefault('rematch_requests', set()).add(player_color)
-                            
-                            # Notify opponent
-                            if opponent_ws and not opponent_ws.closed:
-                                await opponent_ws.send_json({
-                                    'type': 'rematch_requested'
-                                })
-                            
-                            # Check if both players want rematch
-                            if len(game.get('rematch_requests', set())) >= 2:
-                                # Both want rematch - swap colors and start new game
-                                new_game_id = f"game_{len(games)}"
-                                # Swap colors
-                                new_white = game['players']['black']
-                                new_black = game['players']['white']
-                                
-                                games[new_game_id] = {
-                                    'players': {
-                                        'white': new_white,
-                                        'black': new_black
-                                    },
-                                    'current_turn': 'white'
-                                }
-                                
-                                # Update player tracking
-                                player_games[new_white] = {'game_id': new_game_id, 'color': 'white'}
-                                player_games[new_black] = {'game_id': new_game_id, 'color': 'black'}
-                                
-                                # Notify both players
-                                await new_white.send_json({
-                                    'type': 'rematch_start',
-                                    'game_id': new_game_id,
-                                    'color': 'white'
-                                })
-                                await new_black.send_json({
-                                    'type': 'rematch_start',
-                                    'game_id': new_game_id,
-                                    'color': 'black'
-                                })
-                                
-                                # Clean up old game
-                                del games[game_id]
-                        
-            elif msg.type == aiohttp.WSMsgType.ERROR:
-                print(f'WebSocket error: {ws.exception()}')
-    
-    except Exception as e:
-        print(f'Error: {e}')
+            elif msg_type is WS_ERROR:
+                log.warning('WebSocket error: %s', ws.exception())
+    
+    except Exception:
+        log.exception('WebSocket handler error')
     
     finally:
         # Clean up on disconnect
-        if waiting_player == ws:
-            waiting_player = None
-            waiting_player_info = None
-        
-        player_info = player_games.get(ws)
-        if player_info:
-            game_id = player_info['game_id']
-            player_color = player_info['color']
-            if game_id in games:
-                game = games[game_id]
-                opponent_color = 'black' if player_color == 'white' else 'white'
-                opponent_ws = game['players'].get(opponent_color)
-                if opponent_ws and not opponent_ws.closed:
-                    await opponent_ws.send_json({
-                        'type': 'opponent_disconnected'
-                    })
-                # Clean up opponent's entry
-                if opponent_ws in player_games:
-                    del player_games[opponent_ws]
-                del games[game_id]
-            del player_games[ws]
+        writer.cancel()
+        outboxes.pop(ws, None)
+        matchmaker.disconnect(ws)
     
     return ws
 
 
 async def health_check(request):
     """Health check endpoint for Railway."""
+    matchmaker = request.app[MATCHMAKER]
     return web.json_response({
         'status': 'ok',
-        'games_active': len(games),
-        'player_waiting': waiting_player is not None
-    })
+        'games_active': len(matchmaker.games),
+        'player_waiting': matchmaker.waiting_player is not None
+    }, dumps=json_dumps)
 
 
 async def index(request):
@@ -214,13 +340,30 @@ async def index(request):
 
 def create_app():
     app = web.Application()
+    app[MATCHMAKER] = MatchMaker()
     app.router.add_get('/', index)
     app.router.add_get('/health', health_check)
     app.router.add_get('/ws', websocket_handler)
     return app
 
 
+def setup_logging():
+    """Send log records through a queue so the event loop never blocks on stderr."""
+    log_queue = queue.SimpleQueue()
+    logging.basicConfig(level=logging.WARNING,
+                        handlers=[logging.handlers.QueueHandler(log_queue)])
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    return listener
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
+    listener = setup_logging()
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     app = create_app()
-    web.run_app(app, host='0.0.0.0', port=port)
+    try:
+        web.run_app(app, host='0.0.0.0', port=port)
+    finally:
+        listener.stop()  # Flush records still queued at shutdown